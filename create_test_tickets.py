@@ -5,6 +5,8 @@ import os
 import django
 import sys
 from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone
 
 # Setup Django environment
@@ -17,56 +19,51 @@ from crm.models import Customer
 from ticketing.models import Ticket, TicketComment, TicketHistory
 
 
+@transaction.atomic
 def create_test_tickets():
     """Create sample tickets for testing."""
 
     print("Creating test tickets...")
 
-    # Get or create test users
-    admin_user = User.objects.filter(is_superuser=True).first()
+    # Get up to three users in one query, superusers first
+    users = list(User.objects.order_by('-is_superuser', 'id')[:3])
+    admin_user = users[0] if users and users[0].is_superuser else None
     if not admin_user:
         print("No admin user found. Please create a superuser first.")
         return
 
-    # Get other users or use admin
-    users = list(User.objects.all()[:3])
-    if not users:
-        users = [admin_user]
-
     # Get customers
     customers = list(Customer.objects.all())
     if not customers:
         print("No customers found. Creating sample customers...")
         # Create sample customers
-        customers = [
-            Customer.objects.create(
+        sample_customers = [
+            Customer(
                 company_name="Tech Solutions Inc",
-                email="contact@techsolutions.com",
-                phone="555-0101",
                 address="123 Tech Street",
                 city="San Francisco",
                 state="CA",
                 country="USA"
             ),
-            Customer.objects.create(
+            Customer(
                 company_name="Global Enterprises",
-                email="info@globalent.com",
-                phone="555-0102",
                 address="456 Business Ave",
                 city="New York",
                 state="NY",
                 country="USA"
             ),
-            Customer.objects.create(
+            Customer(
                 company_name="StartUp Innovations",
-                email="hello@startupinno.com",
-                phone="555-0103",
                 address="789 Innovation Blvd",
                 city="Austin",
                 state="TX",
                 country="USA"
             ),
         ]
+        Customer.objects.bulk_create(sample_customers, ignore_conflicts=True)
+        customers = list(Customer.objects.filter(
+            company_name__in=[c.company_name for c in sample_customers]
+        ))
         print(f"Created {len(customers)} sample customers")
 
     # Sample ticket data
@@ -153,26 +150,36 @@ def create_test_tickets():
         },
     ]
 
-    created_tickets = []
+    # bulk_create() bypasses Ticket.save(), so ticket numbers are assigned here
+    last_ticket = Ticket.objects.order_by('id').last()
+    next_number = int(last_ticket.ticket_number.replace('TKT-', '')) + 1 if last_ticket else 1
+
+    # Due dates (some overdue, some upcoming), computed once for every ticket
+    now = timezone.now()
+    overdue_date = now - timedelta(days=2)
+    due_soon_date = now + timedelta(days=1)
+    due_later_date = now + timedelta(days=7)
+    resolved_at = now - timedelta(hours=5)
+
+    tickets_to_create = []
 
     for i, ticket_data in enumerate(sample_tickets):
         # Assign to different customers and users
         customer = customers[i % len(customers)]
         assigned_user = users[i % len(users)] if i % 3 != 0 else None  # Leave some unassigned
 
-        # Create due date (some overdue, some upcoming)
         if i % 4 == 0:
             # Make some tickets overdue
-            due_date = timezone.now() - timedelta(days=2)
+            due_date = overdue_date
         elif i % 3 == 0:
             # Some tickets due soon
-            due_date = timezone.now() + timedelta(days=1)
+            due_date = due_soon_date
         else:
             # Others due in the future
-            due_date = timezone.now() + timedelta(days=7)
+            due_date = due_later_date
 
-        # Create ticket
-        ticket = Ticket.objects.create(
+        ticket = Ticket(
+            ticket_number=f'TKT-{next_number + i:06d}',
             subject=ticket_data['subject'],
             description=ticket_data['description'],
             status=ticket_data['status'],
@@ -186,60 +193,90 @@ def create_test_tickets():
             tags=ticket_data['tags']
         )
 
+        # If resolved, set resolved time up front instead of saving again later
+        if ticket.status == 'resolved':
+            ticket.resolved_at = resolved_at
+            ticket.actual_hours = 3.5
+
+        tickets_to_create.append(ticket)
+
+    created_tickets = Ticket.objects.bulk_create(tickets_to_create)
+
+    comments = []
+    for i, ticket in enumerate(created_tickets):
         # Add some comments to tickets
         if i % 2 == 0:
-            TicketComment.objects.create(
+            comments.append(TicketComment(
                 ticket=ticket,
                 author=admin_user,
                 content="Thank you for reporting this issue. We are looking into it.",
                 is_internal=False
-            )
+            ))
 
         if i % 3 == 0:
-            TicketComment.objects.create(
+            comments.append(TicketComment(
                 ticket=ticket,
                 author=admin_user,
                 content="Internal note: This is a recurring issue. Need to implement permanent fix.",
                 is_internal=True
-            )
+            ))
 
-        # If resolved, set resolved time and add final comment
+        # Add final comment to resolved tickets
         if ticket.status == 'resolved':
-            ticket.resolved_at = timezone.now() - timedelta(hours=5)
-            ticket.actual_hours = 3.5
-            ticket.save()
-
-            TicketComment.objects.create(
+            comments.append(TicketComment(
                 ticket=ticket,
                 author=admin_user,
                 content="Issue has been resolved. Increased file upload limit to 50MB.",
                 is_internal=False
-            )
-
-        created_tickets.append(ticket)
-        print(f"  [OK] Created ticket: {ticket.ticket_number} - {ticket.subject}")
-
-    print(f"\n[SUCCESS] Successfully created {len(created_tickets)} test tickets!")
-    print("\nTicket Summary:")
-    print(f"  - New: {Ticket.objects.filter(status='new').count()}")
-    print(f"  - Open: {Ticket.objects.filter(status='open').count()}")
-    print(f"  - In Progress: {Ticket.objects.filter(status='in_progress').count()}")
-    print(f"  - Pending: {Ticket.objects.filter(status='pending').count()}")
-    print(f"  - Resolved: {Ticket.objects.filter(status='resolved').count()}")
-    print(f"\nPriority Summary:")
-    print(f"  - Critical: {Ticket.objects.filter(priority='critical').count()}")
-    print(f"  - Urgent: {Ticket.objects.filter(priority='urgent').count()}")
-    print(f"  - High: {Ticket.objects.filter(priority='high').count()}")
-    print(f"  - Medium: {Ticket.objects.filter(priority='medium').count()}")
-    print(f"  - Low: {Ticket.objects.filter(priority='low').count()}")
-    print(f"\nOther Statistics:")
-    print(f"  - Assigned: {Ticket.objects.filter(assigned_to__isnull=False).count()}")
-    print(f"  - Unassigned: {Ticket.objects.filter(assigned_to__isnull=True).count()}")
-    print(f"  - Overdue: {sum(1 for t in Ticket.objects.all() if t.is_overdue)}")
-    print(f"\nYou can now:")
-    print(f"  - View tickets at: http://localhost:8000/api/ticketing/tickets/")
-    print(f"  - Manage in admin: http://localhost:8000/admin/ticketing/ticket/")
-    print(f"  - View statistics: http://localhost:8000/api/ticketing/tickets/statistics/")
+            ))
+
+    TicketComment.objects.bulk_create(comments)
+
+    sys.stdout.write("".join(
+        f"  [OK] Created ticket: {ticket.ticket_number} - {ticket.subject}\n"
+        for ticket in created_tickets
+    ))
+
+    stats = Ticket.objects.aggregate(
+        new=Count('id', filter=Q(status='new')),
+        open=Count('id', filter=Q(status='open')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        pending=Count('id', filter=Q(status='pending')),
+        resolved=Count('id', filter=Q(status='resolved')),
+        critical=Count('id', filter=Q(priority='critical')),
+        urgent=Count('id', filter=Q(priority='urgent')),
+        high=Count('id', filter=Q(priority='high')),
+        medium=Count('id', filter=Q(priority='medium')),
+        low=Count('id', filter=Q(priority='low')),
+        assigned=Count('id', filter=Q(assigned_to__isnull=False)),
+        unassigned=Count('id', filter=Q(assigned_to__isnull=True)),
+        overdue=Count('id', filter=Q(due_date__lt=now) & ~Q(status__in=['resolved', 'closed'])),
+    )
+
+    lines = [
+        f"\n[SUCCESS] Successfully created {len(created_tickets)} test tickets!",
+        "\nTicket Summary:",
+        f"  - New: {stats['new']}",
+        f"  - Open: {stats['open']}",
+        f"  - In Progress: {stats['in_progress']}",
+        f"  - Pending: {stats['pending']}",
+        f"  - Resolved: {stats['resolved']}",
+        "\nPriority Summary:",
+        f"  - Critical: {stats['critical']}",
+        f"  - Urgent: {stats['urgent']}",
+        f"  - High: {stats['high']}",
+        f"  - Medium: {stats['medium']}",
+        f"  - Low: {stats['low']}",
+        "\nOther Statistics:",
+        f"  - Assigned: {stats['assigned']}",
+        f"  - Unassigned: {stats['unassigned']}",
+        f"  - Overdue: {stats['overdue']}",
+        "\nYou can now:",
+        "  - View tickets at: http://localhost:8000/api/ticketing/tickets/",
+        "  - Manage in admin: http://localhost:8000/admin/ticketing/ticket/",
+        "  - View statistics: http://localhost:8000/api/ticketing/tickets/statistics/",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == '__main__':
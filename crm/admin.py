@@ -40,11 +40,24 @@ class CustomerAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate contact/order counts to avoid two COUNT queries per row"""
+        return super().get_queryset(request).with_counts()
+
+    @admin.display(ordering='_total_contacts', description='Total contacts')
+    def total_contacts(self, obj):
+        return obj.total_contacts
+
+    @admin.display(ordering='_total_purchase_orders', description='Total purchase orders')
+    def total_purchase_orders(self, obj):
+        return obj.total_purchase_orders
+
 
 @admin.register(Contact)
 class ContactAdmin(admin.ModelAdmin):
     list_display = ['full_name', 'customer', 'title', 'email', 'phone', 'is_primary', 'is_active', 'created_at']
     list_filter = ['is_primary', 'is_active', 'customer', 'created_at']
+    list_select_related = ['customer']
     search_fields = ['first_name', 'last_name', 'email', 'customer__company_name']
     readonly_fields = ['full_name', 'created_at', 'updated_at']
 
@@ -59,6 +72,7 @@ class ContactAdmin(admin.ModelAdmin):
 class InteractionAdmin(admin.ModelAdmin):
     list_display = ['subject', 'customer', 'contact', 'interaction_type', 'interaction_date', 'user']
     list_filter = ['interaction_type', 'interaction_date', 'customer']
+    list_select_related = ['customer', 'contact__customer', 'user']
     search_fields = ['subject', 'description', 'customer__company_name', 'contact__first_name', 'contact__last_name']
     readonly_fields = ['interaction_date', 'created_at', 'updated_at']
     date_hierarchy = 'interaction_date'
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['customer', 'is_active', 'is_primary'], name='crm_contact_custome_dedc88_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['customer_type', 'country'], name='crm_custome_custome_1376d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['country'], name='crm_custome_country_ac5da9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interaction',
+            index=models.Index(fields=['customer', 'interaction_type', '-interaction_date'], name='crm_interac_custome_42e71b_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0002_contact_crm_contact_custome_dedc88_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interaction',
+            index=models.Index(fields=['interaction_date'], name='crm_interac_interac_241720_idx'),
+        ),
+    ]
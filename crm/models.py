@@ -1,7 +1,17 @@
 from django.db import models
+from django.db.models import Count
 from django.contrib.auth.models import User
 
 
+class CustomerQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate the counts read by Customer.total_contacts/total_purchase_orders"""
+        return self.annotate(
+            _total_contacts=Count('contacts', distinct=True),
+            _total_purchase_orders=Count('purchase_orders', distinct=True)
+        )
+
+
 class Customer(models.Model):
     """Company/Business customer"""
     CUSTOMER_TYPE_CHOICES = [
@@ -30,8 +40,14 @@ class Customer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CustomerQuerySet.as_manager()
+
     class Meta:
         ordering = ['company_name']
+        indexes = [
+            models.Index(fields=['customer_type', 'country']),
+            models.Index(fields=['country']),
+        ]
 
     def __str__(self):
         return self.company_name
@@ -39,11 +55,15 @@ class Customer(models.Model):
     @property
     def total_contacts(self):
         """Get total number of contacts"""
+        if hasattr(self, '_total_contacts'):
+            return self._total_contacts
         return self.contacts.count()
 
     @property
     def total_purchase_orders(self):
         """Get total number of purchase orders"""
+        if hasattr(self, '_total_purchase_orders'):
+            return self._total_purchase_orders
         return self.purchase_orders.count()
 
 
@@ -71,6 +91,9 @@ class Contact(models.Model):
 
     class Meta:
         ordering = ['-is_primary', 'first_name', 'last_name']
+        indexes = [
+            models.Index(fields=['customer', 'is_active', 'is_primary']),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.customer.company_name})"
@@ -106,6 +129,10 @@ class Interaction(models.Model):
 
     class Meta:
         ordering = ['-interaction_date']
+        indexes = [
+            models.Index(fields=['customer', 'interaction_type', '-interaction_date']),
+            models.Index(fields=['interaction_date']),
+        ]
 
     def __str__(self):
         return f"{self.interaction_type}: {self.subject} - {self.customer.company_name}"
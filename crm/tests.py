@@ -1,3 +1,58 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from inventory.models import Supplier, PurchaseOrder
+from .models import Customer, Contact, Interaction
+
+
+class CustomerDetailActionQueryTests(APITestCase):
+    """The customer detail actions run a fixed number of queries, however many rows they return"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.customer = Customer.objects.create(company_name='Acme')
+        cls.supplier = Supplier.objects.create(name='Parts Co')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def add_rows(self, count):
+        start = Contact.objects.count()
+        for n in range(start, start + count):
+            contact = Contact.objects.create(
+                customer=self.customer, first_name=f'First{n}', last_name=f'Last{n}'
+            )
+            Interaction.objects.create(
+                customer=self.customer, contact=contact, user=self.user,
+                interaction_type='call', subject=f'Call {n}', description='Notes'
+            )
+            PurchaseOrder.objects.create(
+                order_number=f'PO-{n}', supplier=self.supplier, customer=self.customer
+            )
+
+    # session read, then SAVEPOINT / UPDATE / RELEASE from the inactivity-timeout middleware
+    session_queries = 4
+
+    def assert_action_queries(self, action, num):
+        url = f'/api/crm/customers/{self.customer.pk}/{action}/'
+        # The first request creates the inactivity-timeout session
+        self.client.get(url)
+        for count in (1, 5):
+            self.add_rows(count)
+            with self.assertNumQueries(num + self.session_queries):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data), Contact.objects.count())
+
+    def test_contacts(self):
+        # customer, prefetched contacts
+        self.assert_action_queries('contacts', 2)
+
+    def test_interactions(self):
+        # customer, interactions joined with customer/contact/user
+        self.assert_action_queries('interactions', 2)
+
+    def test_purchase_orders(self):
+        # customer, orders joined with supplier and annotated with their totals
+        self.assert_action_queries('purchase_orders', 2)
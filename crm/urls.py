@@ -1,8 +1,8 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import CustomerViewSet, ContactViewSet, InteractionViewSet
 
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'customers', CustomerViewSet, basename='customer')
 router.register(r'contacts', ContactViewSet, basename='contact')
 router.register(r'interactions', InteractionViewSet, basename='interaction')
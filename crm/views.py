@@ -2,8 +2,8 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from datetime import datetime
-from ozed_tech_project.export_utils import CSVExporter, ExcelExporter
+from django.db.models import Prefetch
+from ozed_tech_project.export_utils import CSVExporter, ExcelExporter, export_filename
 from .models import Customer, Contact, Interaction
 from .serializers import (
     CustomerSerializer,
@@ -13,6 +13,14 @@ from .serializers import (
 )
 
 
+# Columns read by the customer CSV/Excel exports, in output order
+CUSTOMER_EXPORT_FIELDS = [
+    'company_name', 'customer_type', 'industry', 'address', 'city', 'state',
+    'country', 'postal_code', 'credit_limit', 'website', 'created_at'
+]
+CUSTOMER_TYPE_DISPLAY = dict(Customer.CUSTOMER_TYPE_CHOICES)
+
+
 class CustomerViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing customers
@@ -23,6 +31,21 @@ class CustomerViewSet(viewsets.ModelViewSet):
     ordering_fields = ['company_name', 'created_at', 'customer_type']
     filterset_fields = ['customer_type', 'country']
 
+    def get_queryset(self):
+        """Annotate contact/order counts and prefetch contacts where they are serialized"""
+        queryset = Customer.objects.all()
+        if self.action in ['list', 'retrieve']:
+            queryset = queryset.with_counts()
+        if self.action in ['retrieve', 'contacts']:
+            queryset = queryset.prefetch_related(Prefetch(
+                'contacts',
+                queryset=Contact.objects.only(
+                    'id', 'customer', 'first_name', 'last_name', 'title', 'email', 'phone',
+                    'mobile', 'is_primary', 'is_active', 'created_at', 'updated_at'
+                )
+            ))
+        return queryset
+
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
         if self.action == 'list':
@@ -41,7 +64,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
     def interactions(self, request, pk=None):
         """Get all interactions for a customer"""
         customer = self.get_object()
-        interactions = customer.interactions.all()
+        interactions = customer.interactions.select_related('customer', 'contact', 'user').all()
         serializer = InteractionSerializer(interactions, many=True)
         return Response(serializer.data)
 
@@ -50,7 +73,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         """Get all purchase orders for a customer"""
         from inventory.serializers import PurchaseOrderListSerializer
         customer = self.get_object()
-        orders = customer.purchase_orders.all()
+        orders = customer.purchase_orders.select_related('supplier').with_totals()
         serializer = PurchaseOrderListSerializer(orders, many=True)
         return Response(serializer.data)
 
@@ -59,59 +82,57 @@ class CustomerViewSet(viewsets.ModelViewSet):
         """Export customers to CSV"""
         customers = self.filter_queryset(self.get_queryset())
 
-        headers = ['Company Name', 'Customer Type', 'Industry', 'Email', 'Phone',
-                  'Address', 'City', 'State', 'Country', 'Postal Code',
-                  'Credit Limit', 'Website', 'Created Date']
-
-        rows = []
-        for customer in customers:
-            rows.append([
-                customer.company_name,
-                customer.get_customer_type_display(),
-                customer.industry or 'N/A',
-                customer.email or 'N/A',
-                customer.phone or 'N/A',
-                customer.address or 'N/A',
-                customer.city or 'N/A',
-                customer.state or 'N/A',
-                customer.country or 'N/A',
-                customer.postal_code or 'N/A',
-                f'{customer.credit_limit:.2f}' if customer.credit_limit else 'N/A',
-                customer.website or 'N/A',
-                customer.created_at.strftime('%Y-%m-%d')
-            ])
-
-        filename = f'customers_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        return CSVExporter.export_to_csv(filename, headers, rows)
+        headers = ['Company Name', 'Customer Type', 'Industry', 'Address', 'City',
+                  'State', 'Country', 'Postal Code', 'Credit Limit', 'Website', 'Created Date']
+
+        def rows():
+            for (company_name, customer_type, industry, address, city, state, country,
+                 postal_code, credit_limit, website, created_at) in customers.values_list(
+                    *CUSTOMER_EXPORT_FIELDS).iterator(chunk_size=2000):
+                yield [
+                    company_name,
+                    CUSTOMER_TYPE_DISPLAY.get(customer_type, customer_type),
+                    industry or 'N/A',
+                    address or 'N/A',
+                    city or 'N/A',
+                    state or 'N/A',
+                    country or 'N/A',
+                    postal_code or 'N/A',
+                    f'{credit_limit:.2f}' if credit_limit else 'N/A',
+                    website or 'N/A',
+                    created_at.date().isoformat()
+                ]
+
+        filename = export_filename('customers', request.user, 'csv')
+        return CSVExporter.stream_to_csv(filename, headers, rows())
 
     @action(detail=False, methods=['get'])
     def export_excel(self, request):
         """Export customers to Excel"""
         customers = self.filter_queryset(self.get_queryset())
 
-        headers = ['Company Name', 'Customer Type', 'Industry', 'Email', 'Phone',
-                  'Address', 'City', 'State', 'Country', 'Postal Code',
-                  'Credit Limit', 'Website', 'Created Date']
+        headers = ['Company Name', 'Customer Type', 'Industry', 'Address', 'City',
+                  'State', 'Country', 'Postal Code', 'Credit Limit', 'Website', 'Created Date']
 
         rows = []
-        for customer in customers:
+        for (company_name, customer_type, industry, address, city, state, country,
+             postal_code, credit_limit, website, created_at) in customers.values_list(
+                *CUSTOMER_EXPORT_FIELDS).iterator(chunk_size=2000):
             rows.append([
-                customer.company_name,
-                customer.get_customer_type_display(),
-                customer.industry or 'N/A',
-                customer.email or 'N/A',
-                customer.phone or 'N/A',
-                customer.address or 'N/A',
-                customer.city or 'N/A',
-                customer.state or 'N/A',
-                customer.country or 'N/A',
-                customer.postal_code or 'N/A',
-                float(customer.credit_limit) if customer.credit_limit else 0,
-                customer.website or 'N/A',
-                customer.created_at.strftime('%Y-%m-%d')
+                company_name,
+                CUSTOMER_TYPE_DISPLAY.get(customer_type, customer_type),
+                industry or 'N/A',
+                address or 'N/A',
+                city or 'N/A',
+                state or 'N/A',
+                country or 'N/A',
+                postal_code or 'N/A',
+                float(credit_limit) if credit_limit else 0,
+                website or 'N/A',
+                created_at.date().isoformat()
             ])
 
-        filename = f'customers_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        filename = export_filename('customers', request.user, 'xlsx')
         return ExcelExporter.export_to_excel(filename, 'Customers', headers, rows)
 
 
@@ -119,7 +140,10 @@ class ContactViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing contacts
     """
-    queryset = Contact.objects.select_related('customer').all()
+    queryset = Contact.objects.select_related('customer').only(
+        'id', 'customer', 'first_name', 'last_name', 'title', 'email', 'phone', 'mobile',
+        'is_primary', 'is_active', 'created_at', 'updated_at', 'customer__company_name'
+    )
     serializer_class = ContactSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['first_name', 'last_name', 'email', 'customer__company_name']
@@ -131,7 +155,11 @@ class InteractionViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing interactions
     """
-    queryset = Interaction.objects.select_related('customer', 'contact', 'user').all()
+    queryset = Interaction.objects.select_related('customer', 'contact', 'user').only(
+        'id', 'customer', 'contact', 'interaction_type', 'subject', 'description',
+        'interaction_date', 'user', 'created_at', 'updated_at',
+        'customer__company_name', 'contact__first_name', 'contact__last_name', 'user__username'
+    )
     serializer_class = InteractionSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['subject', 'description', 'customer__company_name']
@@ -0,0 +1,43 @@
+"""
+Cache keys and invalidation helpers for the dashboard analytics endpoints.
+"""
+import time
+
+from django.core.cache import cache
+
+
+# Signal-based invalidation keeps the numbers fresh; the TTL is only a safety net
+DASHBOARD_CACHE_TTL = 300
+
+OVERVIEW_CACHE_KEY = 'analytics:dashboard:overview:v1'
+INVENTORY_CACHE_KEY = 'analytics:dashboard:inventory:v1'
+SALES_CACHE_KEY = 'analytics:dashboard:sales:v1'
+CUSTOMERS_CACHE_KEY = 'analytics:dashboard:customers:v1'
+ALL_CACHE_KEY = 'analytics:dashboard:all:v1'
+
+DASHBOARD_CACHE_KEYS = [
+    OVERVIEW_CACHE_KEY,
+    INVENTORY_CACHE_KEY,
+    SALES_CACHE_KEY,
+    CUSTOMERS_CACHE_KEY,
+    ALL_CACHE_KEY,
+]
+
+# Counter bumped on every invalidation; dashboard ETags are derived from it
+DASHBOARD_VERSION_KEY = 'etag:dashboard'
+
+
+def get_dashboard_version():
+    """Return the current dashboard data version"""
+    # Seed from the clock so a cleared cache never reuses an old version
+    cache.add(DASHBOARD_VERSION_KEY, time.time_ns(), timeout=None)
+    return cache.get(DASHBOARD_VERSION_KEY)
+
+
+def invalidate_dashboard_cache():
+    """Drop every cached dashboard payload and bump the data version"""
+    cache.delete_many(DASHBOARD_CACHE_KEYS)
+    try:
+        cache.incr(DASHBOARD_VERSION_KEY)
+    except ValueError:
+        cache.add(DASHBOARD_VERSION_KEY, time.time_ns(), timeout=None)
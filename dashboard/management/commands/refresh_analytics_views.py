@@ -0,0 +1,30 @@
+"""
+Management command to refresh the dashboard analytics materialized views.
+
+Usage:
+    python manage.py refresh_analytics_views
+
+This command should be run via cron job or task scheduler every 5-15 minutes.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+from dashboard.cache import invalidate_dashboard_cache
+
+
+ANALYTICS_MATERIALIZED_VIEWS = [
+    'mv_category_stats',
+    'mv_sales_status_breakdown',
+]
+
+
+class Command(BaseCommand):
+    help = 'Refresh the materialized views backing the dashboard analytics'
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            for view in ANALYTICS_MATERIALIZED_VIEWS:
+                # CONCURRENTLY keeps the view readable while it is rebuilt
+                cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {view}')
+                self.stdout.write(self.style.SUCCESS(f'Refreshed {view}'))
+
+        invalidate_dashboard_cache()
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStockRollup',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('category_name', models.CharField(max_length=100, null=True)),
+                ('item_count', models.IntegerField()),
+                ('total_quantity', models.IntegerField()),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'mv_category_stats',
+                'ordering': ['-item_count'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('order_count', models.IntegerField()),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=14, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'mv_daily_sales',
+                'ordering': ['date'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SalesStatusRollup',
+            fields=[
+                ('status', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('order_count', models.IntegerField()),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=14, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'mv_sales_status_breakdown',
+                'ordering': ['status'],
+                'managed': False,
+            },
+        ),
+    ]
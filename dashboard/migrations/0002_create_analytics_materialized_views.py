@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('inventory', '0009_alter_quote_expiration_date'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE MATERIALIZED VIEW mv_daily_sales AS
+                SELECT order_date AS date,
+                       COUNT(id) AS order_count,
+                       SUM(total_amount) AS revenue,
+                       now() AS refreshed_at
+                FROM inventory_salesorder
+                GROUP BY order_date
+                WITH DATA;
+                CREATE UNIQUE INDEX mv_daily_sales_date_uniq ON mv_daily_sales (date);
+            """,
+            reverse_sql="DROP MATERIALIZED VIEW IF EXISTS mv_daily_sales;",
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE MATERIALIZED VIEW mv_category_stats AS
+                SELECT row_number() OVER (ORDER BY c.name) AS id,
+                       c.name AS category_name,
+                       COUNT(i.id) AS item_count,
+                       SUM(i.quantity) AS total_quantity,
+                       now() AS refreshed_at
+                FROM inventory_item i
+                LEFT JOIN inventory_category c ON c.id = i.category_id
+                WHERE i.is_active
+                GROUP BY c.name
+                WITH DATA;
+                CREATE UNIQUE INDEX mv_category_stats_id_uniq ON mv_category_stats (id);
+            """,
+            reverse_sql="DROP MATERIALIZED VIEW IF EXISTS mv_category_stats;",
+        ),
+        migrations.RunSQL(
+            sql="""
+                CREATE MATERIALIZED VIEW mv_sales_status_breakdown AS
+                SELECT status,
+                       COUNT(id) AS order_count,
+                       SUM(total_amount) AS total_amount,
+                       now() AS refreshed_at
+                FROM inventory_salesorder
+                GROUP BY status
+                WITH DATA;
+                CREATE UNIQUE INDEX mv_sales_status_breakdown_status_uniq ON mv_sales_status_breakdown (status);
+            """,
+            reverse_sql="DROP MATERIALIZED VIEW IF EXISTS mv_sales_status_breakdown;",
+        ),
+    ]
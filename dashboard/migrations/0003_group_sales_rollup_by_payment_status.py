@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_create_analytics_materialized_views'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                DROP MATERIALIZED VIEW IF EXISTS mv_sales_status_breakdown;
+                CREATE MATERIALIZED VIEW mv_sales_status_breakdown AS
+                SELECT row_number() OVER (ORDER BY status, payment_status) AS id,
+                       status,
+                       payment_status,
+                       COUNT(id) AS order_count,
+                       SUM(total_amount) AS total_amount,
+                       now() AS refreshed_at
+                FROM inventory_salesorder
+                GROUP BY status, payment_status
+                WITH DATA;
+                CREATE UNIQUE INDEX mv_sales_status_breakdown_uniq
+                    ON mv_sales_status_breakdown (status, payment_status);
+            """,
+            reverse_sql="""
+                DROP MATERIALIZED VIEW IF EXISTS mv_sales_status_breakdown;
+                CREATE MATERIALIZED VIEW mv_sales_status_breakdown AS
+                SELECT status,
+                       COUNT(id) AS order_count,
+                       SUM(total_amount) AS total_amount,
+                       now() AS refreshed_at
+                FROM inventory_salesorder
+                GROUP BY status
+                WITH DATA;
+                CREATE UNIQUE INDEX mv_sales_status_breakdown_status_uniq ON mv_sales_status_breakdown (status);
+            """,
+        ),
+        migrations.AlterModelOptions(
+            name='salesstatusrollup',
+            options={'managed': False, 'ordering': ['status', 'payment_status']},
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:44
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_group_sales_rollup_by_payment_status'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                DROP MATERIALIZED VIEW IF EXISTS mv_daily_sales;
+
+                CREATE TABLE daily_sales_summary (
+                    date date PRIMARY KEY,
+                    order_count integer NOT NULL DEFAULT 0,
+                    revenue numeric(14, 2) NOT NULL DEFAULT 0,
+                    unpaid_amount numeric(14, 2) NOT NULL DEFAULT 0
+                );
+
+                INSERT INTO daily_sales_summary (date, order_count, revenue, unpaid_amount)
+                SELECT order_date,
+                       COUNT(id),
+                       SUM(total_amount),
+                       SUM(CASE WHEN payment_status = 'unpaid'
+                                 AND status IN ('confirmed', 'processing', 'shipped', 'delivered')
+                                THEN total_amount ELSE 0 END)
+                FROM inventory_salesorder
+                GROUP BY order_date;
+
+                CREATE FUNCTION daily_sales_summary_apply(
+                    p_date date, p_count integer, p_amount numeric, p_status varchar, p_payment_status varchar
+                ) RETURNS void AS $$
+                BEGIN
+                    INSERT INTO daily_sales_summary AS s (date, order_count, revenue, unpaid_amount)
+                    VALUES (
+                        p_date,
+                        p_count,
+                        p_count * p_amount,
+                        CASE WHEN p_payment_status = 'unpaid'
+                              AND p_status IN ('confirmed', 'processing', 'shipped', 'delivered')
+                             THEN p_count * p_amount ELSE 0 END
+                    )
+                    ON CONFLICT (date) DO UPDATE SET
+                        order_count = s.order_count + EXCLUDED.order_count,
+                        revenue = s.revenue + EXCLUDED.revenue,
+                        unpaid_amount = s.unpaid_amount + EXCLUDED.unpaid_amount;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE FUNCTION daily_sales_summary_trigger() RETURNS trigger AS $$
+                BEGIN
+                    -- Back out the old row, then apply the new one
+                    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                        PERFORM daily_sales_summary_apply(
+                            OLD.order_date, -1, OLD.total_amount, OLD.status, OLD.payment_status
+                        );
+                    END IF;
+                    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                        PERFORM daily_sales_summary_apply(
+                            NEW.order_date, 1, NEW.total_amount, NEW.status, NEW.payment_status
+                        );
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+
+                CREATE TRIGGER inventory_salesorder_daily_sales_summary
+                AFTER INSERT OR DELETE OR UPDATE OF order_date, total_amount, status, payment_status
+                ON inventory_salesorder
+                FOR EACH ROW EXECUTE FUNCTION daily_sales_summary_trigger();
+            """,
+            reverse_sql="""
+                DROP TRIGGER IF EXISTS inventory_salesorder_daily_sales_summary ON inventory_salesorder;
+                DROP FUNCTION IF EXISTS daily_sales_summary_trigger();
+                DROP FUNCTION IF EXISTS daily_sales_summary_apply(date, integer, numeric, varchar, varchar);
+                DROP TABLE IF EXISTS daily_sales_summary;
+
+                CREATE MATERIALIZED VIEW mv_daily_sales AS
+                SELECT order_date AS date,
+                       COUNT(id) AS order_count,
+                       SUM(total_amount) AS revenue,
+                       now() AS refreshed_at
+                FROM inventory_salesorder
+                GROUP BY order_date
+                WITH DATA;
+                CREATE UNIQUE INDEX mv_daily_sales_date_uniq ON mv_daily_sales (date);
+            """,
+        ),
+        migrations.AlterModelTable(
+            name='dailysalesrollup',
+            table='daily_sales_summary',
+        ),
+    ]
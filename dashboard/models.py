@@ -1,3 +1,51 @@
 from django.db import models
 
-# Create your models here.
+
+class DailySalesRollup(models.Model):
+    """
+    Read-only view of the daily_sales_summary table (orders per day), kept
+    current by triggers on inventory_salesorder.
+    """
+    date = models.DateField(primary_key=True)
+    order_count = models.IntegerField()
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+    unpaid_amount = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        managed = False
+        db_table = 'daily_sales_summary'
+        ordering = ['date']
+
+
+class CategoryStockRollup(models.Model):
+    """
+    Read-only view of the mv_category_stats materialized view (active items per category).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    category_name = models.CharField(max_length=100, null=True)
+    item_count = models.IntegerField()
+    total_quantity = models.IntegerField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'mv_category_stats'
+        ordering = ['-item_count']
+
+
+class SalesStatusRollup(models.Model):
+    """
+    Read-only view of the mv_sales_status_breakdown materialized view
+    (orders per status / payment status pair).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    status = models.CharField(max_length=20)
+    payment_status = models.CharField(max_length=20)
+    order_count = models.IntegerField()
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'mv_sales_status_breakdown'
+        ordering = ['status', 'payment_status']
@@ -0,0 +1,28 @@
+"""
+Django signals for invalidating cached dashboard analytics.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from inventory.models import Category, Item, SalesOrder, PurchaseOrder
+from crm.models import Customer, Interaction
+from .cache import invalidate_dashboard_cache
+
+
+# Models whose rows feed the dashboard aggregates. Order totals rewritten by
+# SalesOrder.objects.recalculate_totals() invalidate from there instead
+DASHBOARD_SOURCE_MODELS = [Category, Item, SalesOrder, PurchaseOrder, Customer, Interaction]
+
+
+def dashboard_source_changed(sender, **kwargs):
+    """
+    Invalidate dashboard caches whenever a model feeding the analytics changes.
+
+    Deferred to commit so a dashboard request racing the writer cannot re-cache
+    pre-commit numbers under the new version; runs immediately in autocommit.
+    """
+    transaction.on_commit(invalidate_dashboard_cache)
+
+
+for model in DASHBOARD_SOURCE_MODELS:
+    post_save.connect(dashboard_source_changed, sender=model)
+    post_delete.connect(dashboard_source_changed, sender=model)
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from crm.models import Customer
+from inventory.models import Item, SalesOrder, SalesOrderItem
+from .cache import OVERVIEW_CACHE_KEY, get_dashboard_version
+
+
+class DashboardInvalidationTests(APITestCase):
+    """Writes feeding the dashboard drop its cache once they commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.customer = Customer.objects.create(company_name='Acme')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.item = Item.objects.create(name='Widget', sku='W-1', quantity=10, unit_price=Decimal('5.00'))
+        self.version = get_dashboard_version()
+        cache.set(OVERVIEW_CACHE_KEY, {'cached': True})
+
+    def assert_invalidated_on_commit(self, write):
+        with self.captureOnCommitCallbacks() as callbacks:
+            write()
+        self.assertEqual(get_dashboard_version(), self.version)
+        self.assertIsNotNone(cache.get(OVERVIEW_CACHE_KEY))
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_dashboard_version(), self.version)
+        self.assertIsNone(cache.get(OVERVIEW_CACHE_KEY))
+
+    def test_model_save(self):
+        self.assert_invalidated_on_commit(
+            lambda: Customer.objects.create(company_name='Globex')
+        )
+
+    def test_model_delete(self):
+        self.assert_invalidated_on_commit(self.item.delete)
+
+    def test_recalculated_totals(self):
+        order = SalesOrder.objects.create(order_number='SO-1', customer=self.customer)
+        SalesOrderItem.objects.bulk_create([
+            SalesOrderItem(sales_order=order, item=self.item, quantity=2, unit_price=Decimal('5.00'))
+        ])
+        self.version = get_dashboard_version()
+        cache.set(OVERVIEW_CACHE_KEY, {'cached': True})
+        self.assert_invalidated_on_commit(
+            lambda: SalesOrder.objects.filter(pk=order.pk).recalculate_totals()
+        )
+
+    def test_stock_adjustment(self):
+        def adjust():
+            response = self.client.post(
+                f'/api/inventory/items/{self.item.pk}/adjust_stock/', {'adjustment': -3}
+            )
+            self.assertEqual(response.status_code, 200)
+        self.assert_invalidated_on_commit(adjust)
@@ -4,6 +4,7 @@ from .views import (
     inventory_analytics,
     sales_analytics,
     customer_analytics,
+    dashboard_all,
     dashboard_view
 )
 
@@ -13,4 +14,5 @@ urlpatterns = [
     path('inventory/', inventory_analytics, name='dashboard-inventory'),
     path('sales/', sales_analytics, name='dashboard-sales'),
     path('customers/', customer_analytics, name='dashboard-customers'),
+    path('all/', dashboard_all, name='dashboard-all'),
 ]
@@ -1,55 +1,73 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Q, Avg, F
+from django.db.models import (
+    Sum, Count, Q, Avg, F, Exists, OuterRef, Subquery, IntegerField,
+    Case, When, Value, CharField, Window
+)
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 from django.shortcuts import render
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 from datetime import timedelta
 from decimal import Decimal
+import hashlib
 
 from inventory.models import Item, SalesOrder, PurchaseOrder
 from crm.models import Customer, Interaction
-
-
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def dashboard_overview(request):
-    """
-    Get overview statistics for the dashboard
-    """
-    today = timezone.now().date()
+from .models import DailySalesRollup, CategoryStockRollup, SalesStatusRollup
+from .cache import (
+    DASHBOARD_CACHE_TTL,
+    OVERVIEW_CACHE_KEY,
+    INVENTORY_CACHE_KEY,
+    SALES_CACHE_KEY,
+    CUSTOMERS_CACHE_KEY,
+    ALL_CACHE_KEY,
+    get_dashboard_version,
+)
+
+
+def dashboard_etag(request, *args, **kwargs):
+    """ETag for dashboard payloads: changes on any data mutation and at midnight"""
+    # Runs before DRF authentication, so only session-authenticated users get a 304
+    if not request.user.is_authenticated:
+        return None
+    version = f'{get_dashboard_version()}:{timezone.now().date()}'
+    return hashlib.blake2b(version.encode(), digest_size=8).hexdigest()
+
+
+def _overview_payload(now=None):
+    """Compute the overview analytics payload"""
+    now = now or timezone.now()
+    today = now.date()
     last_30_days = today - timedelta(days=30)
 
     # Inventory Stats
-    total_items = Item.objects.filter(is_active=True).count()
-    low_stock_count = Item.objects.filter(
-        is_active=True,
-        quantity__lte=F('low_stock_threshold')
-    ).count()
-    out_of_stock_count = Item.objects.filter(is_active=True, quantity=0).count()
-    total_inventory_value = Item.objects.filter(is_active=True).aggregate(
-        total=Sum(F('quantity') * F('unit_price'))
-    )['total'] or Decimal('0.00')
+    inventory_stats = Item.objects.filter(is_active=True).aggregate(
+        total_items=Count('id'),
+        low_stock_count=Count('id', filter=Q(quantity__lte=F('low_stock_threshold'))),
+        out_of_stock_count=Count('id', filter=Q(quantity=0)),
+        total_value=Sum('total_value'),
+    )
+    total_inventory_value = inventory_stats['total_value'] or Decimal('0.00')
 
     # Sales Stats
-    total_sales_orders = SalesOrder.objects.count()
-    confirmed_orders = SalesOrder.objects.filter(status__in=['confirmed', 'processing', 'shipped']).count()
-    pending_orders = SalesOrder.objects.filter(status='draft').count()
-    delivered_orders = SalesOrder.objects.filter(status='delivered').count()
-
-    # Recent sales (last 30 days)
-    recent_sales = SalesOrder.objects.filter(
-        order_date__gte=last_30_days
-    ).aggregate(
-        total_revenue=Sum('total_amount'),
-        order_count=Count('id')
+    sales_stats = SalesOrder.objects.aggregate(
+        total_orders=Count('id'),
+        confirmed_orders=Count('id', filter=Q(status__in=['confirmed', 'processing', 'shipped'])),
+        pending_orders=Count('id', filter=Q(status='draft')),
+        delivered_orders=Count('id', filter=Q(status='delivered')),
     )
 
-    # Payment Status
-    unpaid_amount = SalesOrder.objects.filter(
-        payment_status='unpaid',
-        status__in=['confirmed', 'processing', 'shipped', 'delivered']
-    ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0.00')
+    # Recent sales (last 30 days) and unpaid totals from the trigger-maintained daily summary
+    daily_stats = DailySalesRollup.objects.aggregate(
+        recent_revenue=Sum('revenue', filter=Q(date__gte=last_30_days)),
+        recent_order_count=Sum('order_count', filter=Q(date__gte=last_30_days)),
+        unpaid_amount=Sum('unpaid_amount'),
+    )
 
     # Purchase Orders
     pending_po = PurchaseOrder.objects.filter(
@@ -57,111 +75,147 @@ def dashboard_overview(request):
     ).count()
 
     # CRM Stats
-    total_customers = Customer.objects.count()
-    active_customers = Customer.objects.filter(customer_type='active').count()
-    prospect_customers = Customer.objects.filter(customer_type='prospect').count()
+    customer_stats = Customer.objects.aggregate(
+        total_customers=Count('id'),
+        active_customers=Count('id', filter=Q(customer_type='active')),
+        prospect_customers=Count('id', filter=Q(customer_type='prospect')),
+    )
 
     # Recent interactions
     recent_interactions = Interaction.objects.filter(
-        interaction_date__gte=timezone.now() - timedelta(days=7)
+        interaction_date__gte=now - timedelta(days=7)
     ).count()
 
-    return Response({
+    return {
         'inventory': {
-            'total_items': total_items,
-            'low_stock_count': low_stock_count,
-            'out_of_stock_count': out_of_stock_count,
-            'total_value': float(total_inventory_value),
+            'total_items': inventory_stats['total_items'],
+            'low_stock_count': inventory_stats['low_stock_count'],
+            'out_of_stock_count': inventory_stats['out_of_stock_count'],
+            'total_value': total_inventory_value,
         },
         'sales': {
-            'total_orders': total_sales_orders,
-            'confirmed_orders': confirmed_orders,
-            'pending_orders': pending_orders,
-            'delivered_orders': delivered_orders,
-            'recent_revenue': float(recent_sales['total_revenue'] or 0),
-            'recent_order_count': recent_sales['order_count'],
-            'unpaid_amount': float(unpaid_amount),
+            'total_orders': sales_stats['total_orders'],
+            'confirmed_orders': sales_stats['confirmed_orders'],
+            'pending_orders': sales_stats['pending_orders'],
+            'delivered_orders': sales_stats['delivered_orders'],
+            'recent_revenue': daily_stats['recent_revenue'] or Decimal('0.00'),
+            'recent_order_count': daily_stats['recent_order_count'] or 0,
+            'unpaid_amount': daily_stats['unpaid_amount'] or Decimal('0.00'),
         },
         'purchases': {
             'pending_orders': pending_po,
         },
         'crm': {
-            'total_customers': total_customers,
-            'active_customers': active_customers,
-            'prospect_customers': prospect_customers,
+            'total_customers': customer_stats['total_customers'],
+            'active_customers': customer_stats['active_customers'],
+            'prospect_customers': customer_stats['prospect_customers'],
             'recent_interactions': recent_interactions,
         },
         'period': {
-            'last_30_days': str(last_30_days),
-            'today': str(today),
+            'last_30_days': last_30_days,
+            'today': today,
         }
-    })
+    }
 
 
+@cache_control(private=True, max_age=30, must_revalidate=True)
+@etag(dashboard_etag)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def inventory_analytics(request):
+def dashboard_overview(request):
     """
-    Get detailed inventory analytics
+    Get overview statistics for the dashboard
     """
+    return Response(cache.get_or_set(OVERVIEW_CACHE_KEY, _overview_payload, DASHBOARD_CACHE_TTL))
+
+
+def _inventory_payload():
+    """Compute the inventory analytics payload"""
     from django.db import models
 
-    # Stock alerts
-    low_stock_items = Item.objects.filter(
+    # Stock alerts: one query, newest 10 per bucket (out of stock / low stock)
+    stock_alerts = Item.objects.filter(
         is_active=True,
-        quantity__lte=models.F('low_stock_threshold'),
-        quantity__gt=0
-    ).values('id', 'name', 'sku', 'quantity', 'low_stock_threshold')[:10]
+        quantity__lte=models.F('low_stock_threshold')
+    ).annotate(
+        bucket=Case(
+            When(quantity=0, then=Value('out_of_stock')),
+            default=Value('low_stock'),
+            output_field=CharField()
+        )
+    ).annotate(
+        row_number=Window(RowNumber(), partition_by=[F('bucket')], order_by=F('created_at').desc())
+    ).filter(row_number__lte=10).order_by('-created_at').values(
+        'id', 'name', 'sku', 'quantity', 'low_stock_threshold', 'bucket'
+    )
 
-    out_of_stock_items = Item.objects.filter(
-        is_active=True,
-        quantity=0
-    ).values('id', 'name', 'sku')[:10]
+    low_stock_items = []
+    out_of_stock_items = []
+    for row in stock_alerts:
+        if row.pop('bucket') == 'out_of_stock':
+            out_of_stock_items.append({'id': row['id'], 'name': row['name'], 'sku': row['sku']})
+        else:
+            low_stock_items.append(row)
 
     # Top items by value
     top_items_by_value = Item.objects.filter(
         is_active=True
-    ).annotate(
-        total_value=models.F('quantity') * models.F('unit_price')
     ).order_by('-total_value').values('id', 'name', 'sku', 'quantity', 'unit_price', 'total_value')[:10]
 
-    # Category distribution
-    category_stats = Item.objects.filter(
-        is_active=True
-    ).values('category__name').annotate(
-        item_count=Count('id'),
-        total_quantity=Sum('quantity')
-    ).order_by('-item_count')
-
-    return Response({
-        'low_stock_items': list(low_stock_items),
-        'out_of_stock_items': list(out_of_stock_items),
-        'top_items_by_value': list(top_items_by_value),
-        'category_distribution': list(category_stats),
-    })
-
+    # Category distribution, read from the mv_category_stats rollup
+    category_stats = list(CategoryStockRollup.objects.all())
 
+    return {
+        'low_stock_items': low_stock_items,
+        'out_of_stock_items': out_of_stock_items,
+        'top_items_by_value': list(top_items_by_value),
+        'category_distribution': [
+            {
+                'category__name': row.category_name,
+                'item_count': row.item_count,
+                'total_quantity': row.total_quantity,
+            }
+            for row in category_stats
+        ],
+        'refreshed_at': category_stats[0].refreshed_at if category_stats else None,
+    }
+
+
+@cache_control(private=True, max_age=30, must_revalidate=True)
+@etag(dashboard_etag)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def sales_analytics(request):
+def inventory_analytics(request):
     """
-    Get detailed sales analytics
+    Get detailed inventory analytics
     """
-    today = timezone.now().date()
+    return Response(cache.get_or_set(INVENTORY_CACHE_KEY, _inventory_payload, DASHBOARD_CACHE_TTL))
+
+
+def _sales_payload(now=None):
+    """Compute the sales analytics payload"""
+    today = (now or timezone.now()).date()
     last_30_days = today - timedelta(days=30)
     last_7_days = today - timedelta(days=7)
 
-    # Sales by status
-    status_breakdown = SalesOrder.objects.values('status').annotate(
-        count=Count('id'),
-        total_amount=Sum('total_amount')
-    ).order_by('status')
-
-    # Payment status breakdown
-    payment_breakdown = SalesOrder.objects.values('payment_status').annotate(
-        count=Count('id'),
-        total_amount=Sum('total_amount')
-    ).order_by('payment_status')
+    # Sales by status and by payment status, folded from the single
+    # (status, payment_status) rollup in mv_sales_status_breakdown
+    status_rows = list(SalesStatusRollup.objects.all())
+    by_status = {}
+    by_payment = {}
+    for row in status_rows:
+        amount = row.total_amount or Decimal('0.00')
+        entry = by_status.setdefault(
+            row.status, {'status': row.status, 'count': 0, 'total_amount': Decimal('0.00')}
+        )
+        entry['count'] += row.order_count
+        entry['total_amount'] += amount
+        entry = by_payment.setdefault(
+            row.payment_status,
+            {'payment_status': row.payment_status, 'count': 0, 'total_amount': Decimal('0.00')}
+        )
+        entry['count'] += row.order_count
+        entry['total_amount'] += amount
 
     # Top customers by revenue
     top_customers = SalesOrder.objects.filter(
@@ -179,47 +233,58 @@ def sales_analytics(request):
         'order_date', 'status', 'total_amount'
     ).order_by('-order_date')[:10]
 
-    # Daily sales trend (last 30 days)
-    from django.db.models.functions import TruncDate
-    daily_sales = SalesOrder.objects.filter(
-        order_date__gte=last_30_days
-    ).annotate(
-        date=TruncDate('order_date')
-    ).values('date').annotate(
-        count=Count('id'),
-        revenue=Sum('total_amount')
-    ).order_by('date')
-
-    return Response({
-        'status_breakdown': list(status_breakdown),
-        'payment_breakdown': list(payment_breakdown),
+    # Daily sales trend (last 30 days), read from the daily_sales_summary table
+    daily_sales = list(DailySalesRollup.objects.filter(date__gte=last_30_days, order_count__gt=0))
+
+    return {
+        'status_breakdown': [by_status[key] for key in sorted(by_status)],
+        'payment_breakdown': [by_payment[key] for key in sorted(by_payment)],
         'top_customers': list(top_customers),
         'recent_orders': list(recent_orders),
-        'daily_sales_trend': list(daily_sales),
-    })
+        'daily_sales_trend': [
+            {'date': row.date, 'count': row.order_count, 'revenue': row.revenue}
+            for row in daily_sales
+        ],
+        'refreshed_at': status_rows[0].refreshed_at if status_rows else None,
+    }
 
 
+@cache_control(private=True, max_age=30, must_revalidate=True)
+@etag(dashboard_etag)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def customer_analytics(request):
+def sales_analytics(request):
     """
-    Get detailed customer analytics
+    Get detailed sales analytics
     """
+    return Response(cache.get_or_set(SALES_CACHE_KEY, _sales_payload, DASHBOARD_CACHE_TTL))
+
+
+def _customer_payload():
+    """Compute the customer analytics payload"""
     # Customer type distribution
     customer_distribution = Customer.objects.values('customer_type').annotate(
         count=Count('id')
     ).order_by('customer_type')
 
+    # Per-customer counts as correlated subqueries, avoiding a full join + GROUP BY
+    order_count_sq = SalesOrder.objects.filter(
+        customer=OuterRef('pk')
+    ).order_by().values('customer').annotate(c=Count('*')).values('c')
+    interaction_count_sq = Interaction.objects.filter(
+        customer=OuterRef('pk')
+    ).order_by().values('customer').annotate(c=Count('*')).values('c')
+
     # Customers with most orders
     customers_by_orders = Customer.objects.annotate(
-        order_count=Count('sales_orders')
+        order_count=Subquery(order_count_sq, output_field=IntegerField())
     ).filter(order_count__gt=0).order_by('-order_count').values(
         'id', 'company_name', 'customer_type', 'order_count'
     )[:10]
 
     # Customers with most interactions
     customers_by_interactions = Customer.objects.annotate(
-        interaction_count=Count('interactions')
+        interaction_count=Subquery(interaction_count_sq, output_field=IntegerField())
     ).filter(interaction_count__gt=0).order_by('-interaction_count').values(
         'id', 'company_name', 'interaction_count'
     )[:10]
@@ -230,19 +295,59 @@ def customer_analytics(request):
     ).order_by('-count')
 
     # Customers without orders (prospects to follow up)
-    customers_no_orders = Customer.objects.annotate(
-        order_count=Count('sales_orders')
-    ).filter(order_count=0, customer_type='prospect').values(
+    customers_no_orders = Customer.objects.filter(
+        ~Exists(SalesOrder.objects.filter(customer=OuterRef('pk'))),
+        customer_type='prospect'
+    ).values(
         'id', 'company_name', 'created_at'
     ).order_by('-created_at')[:10]
 
-    return Response({
+    return {
         'customer_distribution': list(customer_distribution),
         'top_customers_by_orders': list(customers_by_orders),
         'top_customers_by_interactions': list(customers_by_interactions),
         'interaction_types': list(interaction_types),
         'prospects_to_follow_up': list(customers_no_orders),
-    })
+    }
+
+
+@cache_control(private=True, max_age=30, must_revalidate=True)
+@etag(dashboard_etag)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def customer_analytics(request):
+    """
+    Get detailed customer analytics
+    """
+    return Response(cache.get_or_set(CUSTOMERS_CACHE_KEY, _customer_payload, DASHBOARD_CACHE_TTL))
+
+
+def _all_payload():
+    """Compute every dashboard payload from one consistent snapshot"""
+    now = timezone.now()
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == 'postgresql':
+            # Must be the first statement of the transaction
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY')
+        return {
+            'overview': _overview_payload(now),
+            'inventory': _inventory_payload(),
+            'sales': _sales_payload(now),
+            'customers': _customer_payload(),
+        }
+
+
+@cache_control(private=True, max_age=30, must_revalidate=True)
+@etag(dashboard_etag)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_all(request):
+    """
+    Get overview, inventory, sales and customer analytics in one response
+    """
+    return Response(cache.get_or_set(ALL_CACHE_KEY, _all_payload, DASHBOARD_CACHE_TTL))
 
 
 def dashboard_view(request):
@@ -30,6 +30,7 @@ class SupplierAdmin(admin.ModelAdmin):
 class ItemAdmin(admin.ModelAdmin):
     list_display = ['name', 'sku', 'category', 'supplier', 'quantity', 'unit_price', 'stock_status', 'is_active']
     list_filter = ['category', 'supplier', 'is_active', 'created_at']
+    list_select_related = ['category', 'supplier']
     search_fields = ['name', 'sku', 'description']
     readonly_fields = ['created_at', 'updated_at', 'stock_status', 'is_low_stock', 'total_value']
     actions = [export_items_csv_action, export_items_excel_action]
@@ -53,6 +54,10 @@ class ItemAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate stock status for the changelist column and export actions"""
+        return super().get_queryset(request).with_stock_status()
+
 
 class PurchaseOrderItemInline(admin.TabularInline):
     model = PurchaseOrderItem
@@ -70,6 +75,7 @@ class PurchaseOrderItemInline(admin.TabularInline):
 class PurchaseOrderAdmin(admin.ModelAdmin):
     list_display = ['order_number', 'customer', 'supplier', 'order_date', 'expected_delivery_date', 'status', 'total_amount', 'total_items', 'created_at']
     list_filter = ['status', 'supplier', 'order_date', 'created_at']
+    list_select_related = ['customer', 'supplier']
     search_fields = ['order_number', 'supplier__name', 'customer__company_name', 'notes']
     readonly_fields = ['total_amount', 'total_items', 'created_at', 'updated_at']
     inlines = [PurchaseOrderItemInline]
@@ -93,6 +99,10 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate line item totals to avoid per-row queries in the changelist"""
+        return super().get_queryset(request).with_totals()
+
     def save_model(self, request, obj, form, change):
         """Convert order_number to uppercase before saving"""
         obj.order_number = obj.order_number.upper()
@@ -103,6 +113,7 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
 class PurchaseOrderItemAdmin(admin.ModelAdmin):
     list_display = ['purchase_order', 'item', 'quantity', 'unit_price', 'subtotal']
     list_filter = ['purchase_order__status', 'item__category']
+    list_select_related = ['purchase_order__supplier', 'item']
     search_fields = ['purchase_order__order_number', 'item__name', 'item__sku']
 
     def get_fields(self, request, obj=None):
@@ -133,6 +144,7 @@ class SalesOrderItemInline(admin.TabularInline):
 class SalesOrderAdmin(admin.ModelAdmin):
     list_display = ['order_number', 'customer', 'contact', 'order_date', 'status', 'payment_status', 'total_amount', 'total_items', 'created_at']
     list_filter = ['status', 'payment_status', 'customer', 'order_date', 'created_at']
+    list_select_related = ['customer', 'contact__customer']
     search_fields = ['order_number', 'customer__company_name', 'contact__first_name', 'contact__last_name', 'notes']
     readonly_fields = ['subtotal', 'total_amount', 'total_items', 'total_quantity', 'created_at', 'updated_at']
     actions = [export_sales_orders_csv_action, export_sales_orders_excel_action, generate_invoice_action]
@@ -171,11 +183,16 @@ class SalesOrderAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
         obj.calculate_totals()
 
+    def get_queryset(self, request):
+        """Annotate line item totals to avoid per-row queries in the changelist"""
+        return super().get_queryset(request).with_totals()
+
 
 @admin.register(SalesOrderItem)
 class SalesOrderItemAdmin(admin.ModelAdmin):
     list_display = ['sales_order', 'item', 'quantity', 'unit_price', 'discount', 'subtotal']
     list_filter = ['sales_order__status', 'item__category']
+    list_select_related = ['sales_order__customer', 'item']
     search_fields = ['sales_order__order_number', 'item__name', 'item__sku']
 
     def get_fields(self, request, obj=None):
@@ -208,6 +225,7 @@ class RFQItemInline(admin.TabularInline):
 class RFQAdmin(admin.ModelAdmin):
     list_display = ['rfq_number', 'customer', 'contact', 'requested_by', 'status', 'request_date', 'required_by_date', 'total_items', 'created_at']
     list_filter = ['status', 'customer', 'request_date', 'created_at']
+    list_select_related = ['customer', 'contact__customer', 'requested_by']
     search_fields = ['rfq_number', 'customer__company_name', 'contact__first_name', 'contact__last_name', 'notes']
     readonly_fields = ['total_items', 'total_quantity', 'created_at', 'updated_at']
     inlines = [RFQItemInline]
@@ -232,6 +250,10 @@ class RFQAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate line item totals to avoid per-row queries in the changelist"""
+        return super().get_queryset(request).with_totals()
+
     def save_model(self, request, obj, form, change):
         """Convert rfq_number to uppercase before saving"""
         obj.rfq_number = obj.rfq_number.upper()
@@ -242,6 +264,7 @@ class RFQAdmin(admin.ModelAdmin):
 class RFQItemAdmin(admin.ModelAdmin):
     list_display = ['rfq', 'item', 'requested_quantity', 'created_at']
     list_filter = ['rfq__status', 'item__category']
+    list_select_related = ['rfq__customer', 'item']
     search_fields = ['rfq__rfq_number', 'item__name', 'item__sku']
 
     def get_fields(self, request, obj=None):
@@ -274,6 +297,7 @@ class QuoteItemInline(admin.TabularInline):
 class QuoteAdmin(admin.ModelAdmin):
     list_display = ['quote_number', 'version', 'customer', 'contact', 'sales_rep', 'status', 'quote_date', 'expiration_date', 'is_expired', 'total_amount', 'total_items', 'created_at']
     list_filter = ['status', 'customer', 'sales_rep', 'quote_date', 'created_at']
+    list_select_related = ['customer', 'contact__customer', 'sales_rep']
     search_fields = ['quote_number', 'customer__company_name', 'contact__first_name', 'contact__last_name', 'notes']
     readonly_fields = ['subtotal', 'total_amount', 'total_items', 'total_quantity', 'is_expired', 'created_at', 'updated_at']
     inlines = [QuoteItemInline]
@@ -315,11 +339,16 @@ class QuoteAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
         obj.calculate_totals()
 
+    def get_queryset(self, request):
+        """Annotate line item totals to avoid per-row queries in the changelist"""
+        return super().get_queryset(request).with_totals().with_expiry()
+
 
 @admin.register(QuoteItem)
 class QuoteItemAdmin(admin.ModelAdmin):
     list_display = ['quote', 'item', 'quantity', 'unit_price', 'discount', 'subtotal']
     list_filter = ['quote__status', 'item__category']
+    list_select_related = ['quote__customer', 'item']
     search_fields = ['quote__quote_number', 'item__name', 'item__sku']
 
     def get_fields(self, request, obj=None):
@@ -1,19 +1,38 @@
 """
 Management command to populate the database with test data
 """
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import date, timedelta
 from decimal import Decimal
+import os
 import random
 
 from inventory.models import Category, Supplier, Item, PurchaseOrder, PurchaseOrderItem, SalesOrder, SalesOrderItem
 from crm.models import Customer, Contact, Interaction
 
 
+# Sales tax applied to seeded sales orders
+SALES_TAX_RATE = Decimal('0.08')
+ZERO = Decimal('0.00')
+
+# Pricing options picked at random for seeded sales orders
+ORDER_DISCOUNT_CHOICES = tuple(Decimal(x) for x in (0, 50, 100, 200))
+SHIPPING_COST_CHOICES = tuple(Decimal(x) for x in (0, 25, 50, 75))
+LINE_DISCOUNT_CHOICES = tuple(Decimal(x) for x in (0, 0, 0, 10, 20))  # Most items no discount
+
+# Rows per INSERT for every bulk_create(), keeps large seeds under the
+# PostgreSQL bind-parameter limit
+SEED_BATCH_SIZE = int(os.environ.get('OZED_SEED_BATCH_SIZE', 500))
+
+
 class Command(BaseCommand):
-    help = 'Populate the database with test data for development and testing'
+    help = (
+        'Populate the database with test data for development and testing. '
+        'Set OZED_SEED_BATCH_SIZE to change the bulk insert batch size (default 500).'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -21,23 +40,99 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before populating',
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed, so repeated runs generate the same data (default 42)',
+        )
+
+    def write_rows(self, lines):
+        """Write per-row progress lines in one call, only at verbosity 2 and above"""
+        if self.verbosity >= 2:
+            lines = list(lines)
+            if lines:
+                self.stdout.write('\n'.join(lines))
 
+    def copy_rows(self, model, objs):
+        """Insert unsaved rows with COPY FROM STDIN on PostgreSQL, bulk_create() elsewhere"""
+        if connection.vendor != 'postgresql':
+            model.objects.bulk_create(objs, batch_size=SEED_BATCH_SIZE)
+            return
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        relations = [field for field in fields if field.many_to_one or field.one_to_one]
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            with cursor.copy(f'COPY {table} ({columns}) FROM STDIN') as copy:
+                for obj in objs:
+                    # Rows are built before their parents are saved, so copy the
+                    # parents' keys onto the FK id fields as bulk_create() does
+                    for field in relations:
+                        if not field.is_cached(obj):
+                            continue
+                        parent = getattr(obj, field.name)
+                        if parent is None:
+                            continue
+                        value = getattr(parent, field.target_field.attname)
+                        if value is None:
+                            raise ValueError(
+                                f'copy_rows() prohibited to prevent data loss due to '
+                                f'unsaved related object {field.name!r}.'
+                            )
+                        setattr(obj, field.attname, value)
+                    # pre_save() returns the attribute, filling auto_now timestamps
+                    copy.write_row([
+                        field.get_db_prep_save(field.pre_save(obj, True), connection)
+                        for field in fields
+                    ])
+
+    @transaction.atomic
     def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+
+        if connection.vendor == 'postgresql':
+            # Seed data does not need a durable commit; skip the WAL fsync for
+            # this transaction only (SET LOCAL ends with it)
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL synchronous_commit = OFF')
         if options['clear']:
             self.stdout.write(self.style.WARNING('Clearing existing data...'))
-            SalesOrderItem.objects.all().delete()
-            SalesOrder.objects.all().delete()
-            PurchaseOrderItem.objects.all().delete()
-            PurchaseOrder.objects.all().delete()
-            Interaction.objects.all().delete()
-            Contact.objects.all().delete()
-            Customer.objects.all().delete()
-            Item.objects.all().delete()
-            Supplier.objects.all().delete()
-            Category.objects.all().delete()
+            models_to_clear = [
+                SalesOrderItem, SalesOrder, PurchaseOrderItem, PurchaseOrder,
+                Interaction, Contact, Customer, Item, Supplier, Category,
+            ]
+            if connection.vendor == 'postgresql':
+                # Like the protected FKs on a delete(), refuse while rows outside
+                # the seed set (quotes, RFQs, tickets, ...) still reference it
+                referencing = {
+                    relation.related_model
+                    for model in models_to_clear
+                    for relation in model._meta.related_objects
+                    if relation.related_model not in models_to_clear
+                }
+                in_use = sorted(
+                    model._meta.label for model in referencing if model.objects.exists()
+                )
+                if in_use:
+                    raise CommandError(
+                        f'Cannot clear seed data while these still reference it: {", ".join(in_use)}'
+                    )
+                # TRUNCATE skips the per-row cascade collection and signals; the
+                # trigger-maintained daily_sales_summary is emptied alongside.
+                # PostgreSQL requires CASCADE whenever other tables have FKs to
+                # these, but the check above means it only reaches empty tables
+                tables = [model._meta.db_table for model in models_to_clear]
+                tables.append('daily_sales_summary')
+                with connection.cursor() as cursor:
+                    cursor.execute(f'TRUNCATE {", ".join(tables)} RESTART IDENTITY CASCADE')
+            else:
+                for model in models_to_clear:
+                    model.objects.all().delete()
             self.stdout.write(self.style.SUCCESS('Existing data cleared!'))
 
         self.stdout.write('Starting data population...')
+        rng = random.Random(options['seed'])
 
         # Create or get admin user
         user, created = User.objects.get_or_create(
@@ -67,15 +162,15 @@ class Command(BaseCommand):
             ('Storage', 'Storage devices and solutions'),
             ('Peripherals', 'Computer peripherals and accessories'),
         ]
-        categories = []
-        for name, desc in categories_data:
-            category, created = Category.objects.get_or_create(
-                name=name,
-                defaults={'description': desc}
-            )
-            categories.append(category)
-            if created:
-                self.stdout.write(f'  Created category: {name}')
+        # Upsert on name: one statement, primary keys returned in data order
+        categories = Category.objects.bulk_create(
+            [Category(name=name, description=desc) for name, desc in categories_data],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['description'],
+            batch_size=SEED_BATCH_SIZE
+        )
+        self.write_rows(f'  Saved category: {category.name}' for category in categories)
 
         # Create Suppliers
         self.stdout.write('Creating suppliers...')
@@ -86,62 +181,68 @@ class Command(BaseCommand):
             ('Hardware Solutions', 'Emily Davis', 'emily@hardwaresolutions.com', '+1-555-0104', '321 Hardware Blvd, Austin, TX'),
             ('Network Systems Co', 'David Brown', 'david@networksystems.com', '+1-555-0105', '654 Network Lane, Seattle, WA'),
         ]
-        suppliers = []
-        for name, contact, email, phone, address in suppliers_data:
-            supplier, created = Supplier.objects.get_or_create(
-                name=name,
-                defaults={
-                    'contact_person': contact,
-                    'email': email,
-                    'phone': phone,
-                    'address': address
-                }
-            )
-            suppliers.append(supplier)
-            if created:
-                self.stdout.write(f'  Created supplier: {name}')
+        suppliers = Supplier.objects.bulk_create(
+            [
+                Supplier(name=name, contact_person=contact, email=email, phone=phone, address=address)
+                for name, contact, email, phone, address in suppliers_data
+            ],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['contact_person', 'email', 'phone', 'address'],
+            batch_size=SEED_BATCH_SIZE
+        )
+        self.write_rows(f'  Saved supplier: {supplier.name}' for supplier in suppliers)
 
         # Create Items
         self.stdout.write('Creating inventory items...')
         items_data = [
-            ('Laptop Dell XPS 15', 'DELL-XPS-15', 'High-performance laptop', categories[1], suppliers[0], 15, Decimal('1299.99'), 5),
-            ('Laptop HP Pavilion', 'HP-PAV-14', '14-inch business laptop', categories[1], suppliers[1], 8, Decimal('899.99'), 5),
-            ('Monitor 27" 4K', 'MON-27-4K', '4K Ultra HD monitor', categories[0], suppliers[0], 12, Decimal('399.99'), 3),
-            ('Wireless Mouse', 'MSE-WIRELESS', 'Ergonomic wireless mouse', categories[7], suppliers[1], 45, Decimal('29.99'), 10),
-            ('Mechanical Keyboard', 'KBD-MECH-RGB', 'RGB mechanical keyboard', categories[7], suppliers[0], 22, Decimal('89.99'), 10),
-            ('Office Chair Premium', 'CHR-PREM-01', 'Ergonomic office chair', categories[3], suppliers[2], 5, Decimal('349.99'), 2),
-            ('Standing Desk', 'DSK-STAND-01', 'Adjustable standing desk', categories[3], suppliers[2], 3, Decimal('599.99'), 2),
-            ('USB-C Hub 7-Port', 'HUB-USBC-7', '7-port USB-C hub', categories[7], suppliers[1], 30, Decimal('49.99'), 8),
-            ('External SSD 1TB', 'SSD-EXT-1TB', 'Portable SSD 1TB', categories[6], suppliers[3], 18, Decimal('129.99'), 5),
-            ('Webcam HD Pro', 'CAM-HD-PRO', '1080p HD webcam', categories[7], suppliers[1], 25, Decimal('79.99'), 8),
-            ('Headset Wireless', 'HEAD-WIRE-01', 'Noise-cancelling headset', categories[7], suppliers[0], 0, Decimal('149.99'), 5),
-            ('Router WiFi 6', 'RTR-WIFI6', 'WiFi 6 router', categories[5], suppliers[4], 10, Decimal('199.99'), 3),
-            ('Network Switch 24-Port', 'SW-24PORT', 'Managed 24-port switch', categories[5], suppliers[4], 4, Decimal('299.99'), 2),
-            ('Paper A4 (500 sheets)', 'PAPER-A4-500', 'Premium A4 paper', categories[2], suppliers[2], 120, Decimal('8.99'), 20),
-            ('Printer Ink Cartridge', 'INK-BK-XL', 'Black XL ink cartridge', categories[2], suppliers[2], 2, Decimal('34.99'), 5),
-            ('Whiteboard Large', 'WB-LARGE-01', 'Large magnetic whiteboard', categories[2], suppliers[2], 6, Decimal('159.99'), 2),
-            ('Cable HDMI 6ft', 'CBL-HDMI-6', 'Premium HDMI cable', categories[5], suppliers[1], 55, Decimal('12.99'), 15),
-            ('Power Strip 6-Outlet', 'PWR-STRIP-6', '6-outlet surge protector', categories[0], suppliers[1], 35, Decimal('24.99'), 10),
-            ('Docking Station', 'DOCK-USB-C', 'Universal USB-C docking', categories[7], suppliers[3], 7, Decimal('179.99'), 3),
-            ('Monitor Arm Dual', 'ARM-DUAL-MON', 'Dual monitor arm mount', categories[3], suppliers[2], 9, Decimal('89.99'), 5),
+            ('Laptop Dell XPS 15', 'DELL-XPS-15', 'High-performance laptop', 1, 0, 15, Decimal('1299.99'), 5),
+            ('Laptop HP Pavilion', 'HP-PAV-14', '14-inch business laptop', 1, 1, 8, Decimal('899.99'), 5),
+            ('Monitor 27" 4K', 'MON-27-4K', '4K Ultra HD monitor', 0, 0, 12, Decimal('399.99'), 3),
+            ('Wireless Mouse', 'MSE-WIRELESS', 'Ergonomic wireless mouse', 7, 1, 45, Decimal('29.99'), 10),
+            ('Mechanical Keyboard', 'KBD-MECH-RGB', 'RGB mechanical keyboard', 7, 0, 22, Decimal('89.99'), 10),
+            ('Office Chair Premium', 'CHR-PREM-01', 'Ergonomic office chair', 3, 2, 5, Decimal('349.99'), 2),
+            ('Standing Desk', 'DSK-STAND-01', 'Adjustable standing desk', 3, 2, 3, Decimal('599.99'), 2),
+            ('USB-C Hub 7-Port', 'HUB-USBC-7', '7-port USB-C hub', 7, 1, 30, Decimal('49.99'), 8),
+            ('External SSD 1TB', 'SSD-EXT-1TB', 'Portable SSD 1TB', 6, 3, 18, Decimal('129.99'), 5),
+            ('Webcam HD Pro', 'CAM-HD-PRO', '1080p HD webcam', 7, 1, 25, Decimal('79.99'), 8),
+            ('Headset Wireless', 'HEAD-WIRE-01', 'Noise-cancelling headset', 7, 0, 0, Decimal('149.99'), 5),
+            ('Router WiFi 6', 'RTR-WIFI6', 'WiFi 6 router', 5, 4, 10, Decimal('199.99'), 3),
+            ('Network Switch 24-Port', 'SW-24PORT', 'Managed 24-port switch', 5, 4, 4, Decimal('299.99'), 2),
+            ('Paper A4 (500 sheets)', 'PAPER-A4-500', 'Premium A4 paper', 2, 2, 120, Decimal('8.99'), 20),
+            ('Printer Ink Cartridge', 'INK-BK-XL', 'Black XL ink cartridge', 2, 2, 2, Decimal('34.99'), 5),
+            ('Whiteboard Large', 'WB-LARGE-01', 'Large magnetic whiteboard', 2, 2, 6, Decimal('159.99'), 2),
+            ('Cable HDMI 6ft', 'CBL-HDMI-6', 'Premium HDMI cable', 5, 1, 55, Decimal('12.99'), 15),
+            ('Power Strip 6-Outlet', 'PWR-STRIP-6', '6-outlet surge protector', 0, 1, 35, Decimal('24.99'), 10),
+            ('Docking Station', 'DOCK-USB-C', 'Universal USB-C docking', 7, 3, 7, Decimal('179.99'), 3),
+            ('Monitor Arm Dual', 'ARM-DUAL-MON', 'Dual monitor arm mount', 3, 2, 9, Decimal('89.99'), 5),
         ]
-        items = []
-        for name, sku, desc, category, supplier, qty, price, threshold in items_data:
-            item, created = Item.objects.get_or_create(
-                sku=sku,
-                defaults={
-                    'name': name,
-                    'description': desc,
-                    'category': category,
-                    'supplier': supplier,
-                    'quantity': qty,
-                    'unit_price': price,
-                    'low_stock_threshold': threshold
-                }
-            )
-            items.append(item)
-            if created:
-                self.stdout.write(f'  Created item: {name} (Stock: {qty})')
+        # items_data refers to categories/suppliers by index; map those to primary keys
+        category_ids = [category.pk for category in categories]
+        supplier_ids = [supplier.pk for supplier in suppliers]
+        items = Item.objects.bulk_create(
+            [
+                Item(
+                    name=name,
+                    sku=sku,
+                    description=desc,
+                    category_id=category_ids[category_idx],
+                    supplier_id=supplier_ids[supplier_idx],
+                    quantity=qty,
+                    unit_price=price,
+                    low_stock_threshold=threshold
+                )
+                for name, sku, desc, category_idx, supplier_idx, qty, price, threshold in items_data
+            ],
+            update_conflicts=True,
+            unique_fields=['sku'],
+            update_fields=[
+                'name', 'description', 'category', 'supplier',
+                'quantity', 'unit_price', 'low_stock_threshold'
+            ],
+            batch_size=SEED_BATCH_SIZE
+        )
+        self.write_rows(f'  Saved item: {item.name} (Stock: {item.quantity})' for item in items)
 
         # Create Customers
         self.stdout.write('Creating customers...')
@@ -155,25 +256,31 @@ class Command(BaseCommand):
             ('Premier Partners', 'active', 'Finance', '700 Financial Center, Miami, FL', 'Miami', 'FL', 'USA', '33101', Decimal('60000.00'), 'https://www.premierpartners.com'),
             ('Digital Dynamics', 'active', 'Marketing', '800 Creative Lane, Los Angeles, CA', 'Los Angeles', 'CA', 'USA', '90001', Decimal('40000.00'), 'https://www.digitaldynamics.com'),
         ]
-        customers = []
-        for company, cust_type, industry, addr, city, state, country, postal, credit, website in customers_data:
-            customer, created = Customer.objects.get_or_create(
-                company_name=company,
-                defaults={
-                    'customer_type': cust_type,
-                    'industry': industry,
-                    'address': addr,
-                    'city': city,
-                    'state': state,
-                    'country': country,
-                    'postal_code': postal,
-                    'credit_limit': credit,
-                    'website': website
-                }
-            )
-            customers.append(customer)
-            if created:
-                self.stdout.write(f'  Created customer: {company}')
+        customers = Customer.objects.bulk_create(
+            [
+                Customer(
+                    company_name=company,
+                    customer_type=cust_type,
+                    industry=industry,
+                    address=addr,
+                    city=city,
+                    state=state,
+                    country=country,
+                    postal_code=postal,
+                    credit_limit=credit,
+                    website=website
+                )
+                for company, cust_type, industry, addr, city, state, country, postal, credit, website in customers_data
+            ],
+            update_conflicts=True,
+            unique_fields=['company_name'],
+            update_fields=[
+                'customer_type', 'industry', 'address', 'city', 'state',
+                'country', 'postal_code', 'credit_limit', 'website'
+            ],
+            batch_size=SEED_BATCH_SIZE
+        )
+        self.write_rows(f'  Saved customer: {customer.company_name}' for customer in customers)
 
         # Create Contacts
         self.stdout.write('Creating contacts...')
@@ -186,22 +293,30 @@ class Command(BaseCommand):
             ('Patricia', 'Clark', 'Operations Manager', 'patricia.clark@acmecorp.com', '+1-555-1106', customers[0], False),
             ('David', 'Lewis', 'Purchasing Agent', 'david.lewis@globalent.com', '+1-555-1107', customers[2], False),
         ]
-        contacts = []
-        for first, last, title, email, phone, customer, is_primary in contacts_data:
-            contact, created = Contact.objects.get_or_create(
+        # Contact.email is not unique, so build the lookup by hand instead of in_bulk()
+        contacts_by_email = {
+            contact.email: contact
+            for contact in Contact.objects.filter(
+                email__in=[row[3] for row in contacts_data]
+            ).only('pk', 'email')
+        }
+        new_contacts = [
+            Contact(
+                first_name=first,
+                last_name=last,
+                title=title,
                 email=email,
-                defaults={
-                    'first_name': first,
-                    'last_name': last,
-                    'title': title,
-                    'phone': phone,
-                    'customer': customer,
-                    'is_primary': is_primary
-                }
+                phone=phone,
+                customer=customer,
+                is_primary=is_primary
             )
-            contacts.append(contact)
-            if created:
-                self.stdout.write(f'  Created contact: {first} {last}')
+            for first, last, title, email, phone, customer, is_primary in contacts_data
+            if email not in contacts_by_email
+        ]
+        for contact in Contact.objects.bulk_create(new_contacts, batch_size=SEED_BATCH_SIZE):
+            contacts_by_email[contact.email] = contact
+        self.write_rows(f'  Created contact: {contact.first_name} {contact.last_name}' for contact in new_contacts)
+        contacts = [contacts_by_email[row[3]] for row in contacts_data]
 
         # Create Interactions
         self.stdout.write('Creating interactions...')
@@ -217,120 +332,163 @@ class Command(BaseCommand):
             'Quarterly business review'
         ]
 
+        active_customers = customers[:5]
+        now = timezone.now()
+        interactions = []
         for i in range(15):
-            days_ago = random.randint(1, 60)
-            Interaction.objects.create(
-                customer=random.choice(customers[:5]),  # Active customers
-                contact=random.choice(contacts),
-                interaction_type=random.choice(interaction_types),
-                subject=random.choice(interaction_subjects),
-                description=f'Discussion regarding {random.choice(interaction_subjects).lower()}. Customer expressed interest in our products.',
-                interaction_date=timezone.now() - timedelta(days=days_ago),
+            days_ago = rng.randint(1, 60)
+            interactions.append(Interaction(
+                customer=rng.choice(active_customers),
+                contact=rng.choice(contacts),
+                interaction_type=rng.choice(interaction_types),
+                subject=rng.choice(interaction_subjects),
+                description=f'Discussion regarding {rng.choice(interaction_subjects).lower()}. Customer expressed interest in our products.',
+                interaction_date=now - timedelta(days=days_ago),
                 user=user
-            )
-        self.stdout.write(f'  Created 15 interactions')
+            ))
+        Interaction.objects.bulk_create(interactions, batch_size=SEED_BATCH_SIZE)
+        self.stdout.write(f'  Created {len(interactions)} interactions')
 
         # Create Purchase Orders
         self.stdout.write('Creating purchase orders...')
+        today = date.today()
+        purchase_orders = []
         for i in range(5):
-            days_ago = random.randint(10, 90)
-            order_date = date.today() - timedelta(days=days_ago)
-            expected_date = order_date + timedelta(days=random.randint(7, 21))
+            days_ago = rng.randint(10, 90)
+            order_date = today - timedelta(days=days_ago)
+            expected_date = order_date + timedelta(days=rng.randint(7, 21))
 
-            po = PurchaseOrder.objects.create(
+            purchase_orders.append(PurchaseOrder(
                 order_number=f'PO-2025-{1000 + i}',
-                supplier=random.choice(suppliers),
+                supplier=rng.choice(suppliers),
                 order_date=order_date,
                 expected_delivery_date=expected_date,
-                status=random.choice(['draft', 'pending', 'approved', 'received']),
+                status=rng.choice(['draft', 'pending', 'approved', 'received']),
                 notes=f'Purchase order for inventory restocking - {order_date.strftime("%B %Y")}'
-            )
+            ))
+        # PostgreSQL returns the new primary keys, so the line items can reference them
+        PurchaseOrder.objects.bulk_create(purchase_orders, batch_size=SEED_BATCH_SIZE)
 
-            # Add items to purchase order
-            num_items = random.randint(2, 5)
-            selected_items = random.sample(items, num_items)
+        # Add items to purchase orders
+        purchase_order_items = []
+        for po in purchase_orders:
+            num_items = rng.randint(2, 5)
+            selected_items = rng.sample(items, num_items)
             for item in selected_items:
-                quantity = random.randint(5, 20)
-                PurchaseOrderItem.objects.create(
+                quantity = rng.randint(5, 20)
+                purchase_order_items.append(PurchaseOrderItem(
                     purchase_order=po,
                     item=item,
                     quantity=quantity,
                     unit_price=item.unit_price
-                )
+                ))
+        self.copy_rows(PurchaseOrderItem, purchase_order_items)
 
-            self.stdout.write(f'  Created purchase order: {po.order_number}')
+        self.write_rows(f'  Created purchase order: {po.order_number}' for po in purchase_orders)
 
         # Create Sales Orders
         self.stdout.write('Creating sales orders...')
         statuses = ['draft', 'confirmed', 'processing', 'shipped', 'delivered']
         payment_statuses = ['unpaid', 'partial', 'paid']
 
+        available_items = [item for item in items if item.quantity > 0]
+        max_items_per_order = min(4, len(available_items))
+
+        sales_orders = []
+        sales_order_items = []
         for i in range(12):
-            days_ago = random.randint(1, 45)
-            order_date = date.today() - timedelta(days=days_ago)
-            expected_date = order_date + timedelta(days=random.randint(3, 14))
+            days_ago = rng.randint(1, 45)
+            order_date = today - timedelta(days=days_ago)
+            expected_date = order_date + timedelta(days=rng.randint(3, 14))
 
-            status_choice = random.choice(statuses)
-            payment_choice = random.choice(payment_statuses)
+            status_choice = rng.choice(statuses)
+            payment_choice = rng.choice(payment_statuses)
 
             # More recent orders more likely to be in earlier stages
             if days_ago < 7:
-                status_choice = random.choice(['draft', 'confirmed', 'processing'])
+                status_choice = rng.choice(['draft', 'confirmed', 'processing'])
             elif days_ago < 21:
-                status_choice = random.choice(['processing', 'shipped'])
+                status_choice = rng.choice(['processing', 'shipped'])
             else:
-                status_choice = random.choice(['delivered', 'shipped'])
+                status_choice = rng.choice(['delivered', 'shipped'])
 
-            so = SalesOrder.objects.create(
+            so = SalesOrder(
                 order_number=f'SO-2025-{2000 + i}',
-                customer=random.choice(customers[:5]),  # Active customers only
-                contact=random.choice(contacts),
+                customer=rng.choice(active_customers),  # Active customers only
+                contact=rng.choice(contacts),
                 order_date=order_date,
                 expected_delivery_date=expected_date,
                 status=status_choice,
                 payment_status=payment_choice,
-                discount=Decimal(random.choice([0, 50, 100, 200])),
-                tax=Decimal('0.00'),
-                shipping_cost=Decimal(random.choice([0, 25, 50, 75])),
-                notes=f'Sales order for {order_date.strftime("%B %Y")} - Customer requested expedited shipping' if random.random() > 0.5 else ''
+                discount=rng.choice(ORDER_DISCOUNT_CHOICES),
+                shipping_cost=rng.choice(SHIPPING_COST_CHOICES),
+                notes=f'Sales order for {order_date.strftime("%B %Y")} - Customer requested expedited shipping' if rng.random() > 0.5 else ''
             )
 
             # Add items to sales order (only items with stock)
-            available_items = [item for item in items if item.quantity > 0]
-            num_items = random.randint(1, 4)
-            selected_items = random.sample(available_items, min(num_items, len(available_items)))
+            num_items = rng.randint(1, max_items_per_order)
+            selected_items = rng.sample(available_items, num_items)
 
+            order_items = []
             for item in selected_items:
-                quantity = random.randint(1, min(5, item.quantity))
-                discount_amount = Decimal(random.choice([0, 0, 0, 10, 20]))  # Most items no discount
+                if item.quantity == 0:
+                    continue  # Sold out by an earlier seeded order
+                quantity = rng.randint(1, min(5, item.quantity))
+                discount_amount = rng.choice(LINE_DISCOUNT_CHOICES)
+                if status_choice != 'draft':
+                    # Confirmed orders have taken their stock, as confirm_order does
+                    item.quantity -= quantity
 
-                SalesOrderItem.objects.create(
+                order_items.append(SalesOrderItem(
                     sales_order=so,
                     item=item,
                     quantity=quantity,
                     unit_price=item.unit_price,
                     discount=discount_amount
-                )
+                ))
 
-            so.calculate_totals()
+            # Same totals calculate_totals() would produce, plus sales tax
+            so.subtotal = sum((line.subtotal for line in order_items), ZERO)
+            so.tax = (so.subtotal - so.discount) * SALES_TAX_RATE
+            so.total_amount = so.subtotal - so.discount + so.tax + so.shipping_cost
 
-            # Calculate tax (8% sales tax)
-            so.tax = (so.subtotal - so.discount) * Decimal('0.08')
-            so.calculate_totals()
+            sales_orders.append(so)
+            sales_order_items.extend(order_items)
 
-            self.stdout.write(f'  Created sales order: {so.order_number} - {so.get_status_display()}')
+        # Bulk inserts skip SalesOrderItem.save(), so totals are not recomputed per line
+        SalesOrder.objects.bulk_create(sales_orders, batch_size=SEED_BATCH_SIZE)
+        self.copy_rows(SalesOrderItem, sales_order_items)
+        # Persist the stock taken by confirmed orders in one statement
+        Item.objects.bulk_update(items, ['quantity'], batch_size=SEED_BATCH_SIZE)
+
+        self.write_rows(
+            f'  Created sales order: {so.order_number} - {so.get_status_display()}' for so in sales_orders
+        )
 
         # Summary
         self.stdout.write(self.style.SUCCESS('\n' + '='*50))
         self.stdout.write(self.style.SUCCESS('Database populated successfully!'))
         self.stdout.write(self.style.SUCCESS('='*50))
-        self.stdout.write(f'Categories: {Category.objects.count()}')
-        self.stdout.write(f'Suppliers: {Supplier.objects.count()}')
-        self.stdout.write(f'Items: {Item.objects.count()}')
-        self.stdout.write(f'Customers: {Customer.objects.count()}')
-        self.stdout.write(f'Contacts: {Contact.objects.count()}')
-        self.stdout.write(f'Interactions: {Interaction.objects.count()}')
-        self.stdout.write(f'Purchase Orders: {PurchaseOrder.objects.count()}')
-        self.stdout.write(f'Sales Orders: {SalesOrder.objects.count()}')
+        summary_models = [
+            ('Categories', Category),
+            ('Suppliers', Supplier),
+            ('Items', Item),
+            ('Customers', Customer),
+            ('Contacts', Contact),
+            ('Interactions', Interaction),
+            ('Purchase Orders', PurchaseOrder),
+            ('Sales Orders', SalesOrder),
+        ]
+        # All table counts in one round trip
+        count_columns = ', '.join(
+            f'(SELECT COUNT(*) FROM {connection.ops.quote_name(model._meta.db_table)})'
+            for label, model in summary_models
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {count_columns}')
+            counts = cursor.fetchone()
+        self.stdout.write('\n'.join(
+            f'{label}: {count}' for (label, model), count in zip(summary_models, counts)
+        ))
         self.stdout.write(self.style.SUCCESS('\nAdmin user: admin / admin123'))
         self.stdout.write(self.style.SUCCESS('Server: http://127.0.0.1:8000/'))
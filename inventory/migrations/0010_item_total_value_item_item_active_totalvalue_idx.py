@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_alter_quote_expiration_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='total_value',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('quantity'), '*', models.F('unit_price')), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(models.OrderBy(models.F('total_value'), descending=True), condition=models.Q(('is_active', True)), name='item_active_totalvalue_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0003_interaction_crm_interac_interac_241720_idx'),
+        ('inventory', '0010_item_total_value_item_item_active_totalvalue_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['quantity'], name='item_active_qty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['low_stock_threshold', 'quantity'], name='item_active_lowstock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['status', 'order_date'], name='inventory_s_status_d1a94a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['payment_status', 'status'], include=('total_amount',), name='so_payment_status_incl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['order_date'], include=('total_amount',), name='so_order_date_incl_idx'),
+        ),
+    ]
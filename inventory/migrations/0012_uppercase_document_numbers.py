@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+# (table, column) pairs whose values are stored upper-cased
+DOCUMENT_NUMBER_COLUMNS = [
+    ('inventory_purchaseorder', 'order_number'),
+    ('inventory_salesorder', 'order_number'),
+    ('inventory_rfq', 'rfq_number'),
+    ('inventory_quote', 'quote_number'),
+]
+
+
+def forwards_sql():
+    statements = []
+    for table, column in DOCUMENT_NUMBER_COLUMNS:
+        statements.append(f"""
+            CREATE FUNCTION {table}_upper_{column}() RETURNS trigger AS $$
+            BEGIN
+                NEW.{column} := upper(NEW.{column});
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER {table}_upper_{column}
+            BEFORE INSERT OR UPDATE OF {column} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_upper_{column}();
+        """)
+    return '\n'.join(statements)
+
+
+def reverse_sql():
+    statements = []
+    for table, column in DOCUMENT_NUMBER_COLUMNS:
+        statements.append(f"""
+            DROP TRIGGER IF EXISTS {table}_upper_{column} ON {table};
+            DROP FUNCTION IF EXISTS {table}_upper_{column}();
+        """)
+    return '\n'.join(statements)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_item_item_active_qty_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=forwards_sql(), reverse_sql=reverse_sql()),
+    ]
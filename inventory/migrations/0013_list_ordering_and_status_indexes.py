@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0003_interaction_crm_interac_interac_241720_idx'),
+        ('inventory', '0012_uppercase_document_numbers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['-created_at'], name='inventory_i_created_f66c5f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['is_active', 'category'], name='inventory_i_is_acti_a8ee81_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['-order_date', '-created_at'], name='inventory_p_order_d_3444f7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['status'], name='inventory_p_status_43427b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-quote_date', '-created_at'], name='inventory_q_quote_d_f7724d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['status', 'expiration_date'], name='inventory_q_status_c3be5d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rfq',
+            index=models.Index(fields=['-request_date', '-created_at'], name='inventory_r_request_564833_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rfq',
+            index=models.Index(fields=['status'], name='inventory_r_status_d0bb6b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['-order_date', '-created_at'], name='inventory_s_order_d_f03a31_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['customer', 'status'], name='inventory_s_custome_2b51b9_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0013_list_ordering_and_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='purchaseorderitem',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='quoteitem',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='rfqitem',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='salesorderitem',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorderitem',
+            index=models.Index(fields=['purchase_order'], include=('quantity', 'unit_price'), name='poitem_po_incl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quoteitem',
+            index=models.Index(fields=['quote'], include=('quantity', 'unit_price', 'discount'), name='quoteitem_quote_incl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rfqitem',
+            index=models.Index(fields=['rfq'], include=('requested_quantity',), name='rfqitem_rfq_incl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorderitem',
+            index=models.Index(fields=['sales_order'], include=('quantity', 'unit_price', 'discount'), name='soitem_so_incl_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='purchaseorderitem',
+            constraint=models.UniqueConstraint(fields=('purchase_order', 'item'), name='uniq_po_item'),
+        ),
+        migrations.AddConstraint(
+            model_name='quoteitem',
+            constraint=models.UniqueConstraint(fields=('quote', 'item'), name='uniq_quote_item'),
+        ),
+        migrations.AddConstraint(
+            model_name='rfqitem',
+            constraint=models.UniqueConstraint(fields=('rfq', 'item'), name='uniq_rfq_item'),
+        ),
+        migrations.AddConstraint(
+            model_name='salesorderitem',
+            constraint=models.UniqueConstraint(fields=('sales_order', 'item'), name='uniq_so_item'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0003_interaction_crm_interac_interac_241720_idx'),
+        ('inventory', '0014_line_item_unique_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['-created_at'], name='inventory_p_created_c64a90_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-created_at'], name='inventory_q_created_fa75ab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['-created_at'], name='inventory_s_created_cf329e_idx'),
+        ),
+    ]
@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from datetime import date, timedelta
 from decimal import Decimal
+from dashboard.cache import invalidate_dashboard_cache
 
 
 def get_default_expiration_date():
@@ -9,6 +13,58 @@ def get_default_expiration_date():
     return date.today() + timedelta(days=30)
 
 
+def line_subtotal(line_model, parent_field):
+    """Subquery summing a parent's discounted line subtotals, 0.00 when it has none"""
+    return Coalesce(
+        Subquery(
+            line_model.objects.filter(**{parent_field: OuterRef('pk')})
+            .order_by()
+            .values(parent_field)
+            .annotate(total=Sum(F('quantity') * F('unit_price') - F('discount')))
+            .values('total')
+        ),
+        Value(Decimal('0.00')),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2)
+    )
+
+
+class RecalculateTotals:
+    """on_commit callback recalculating one order, unless this commit already did"""
+
+    def __init__(self, order, done):
+        self.key = (type(order), order.pk)
+        self.done = done
+
+    def __call__(self):
+        connection = transaction.get_connection()
+        # The first callback of a commit detaches the shared set, so the next
+        # transaction starts with a fresh one
+        if getattr(connection, 'order_totals_done', None) is self.done:
+            connection.order_totals_done = None
+        if self.key in self.done:
+            return
+        self.done.add(self.key)
+        model, pk = self.key
+        model.objects.filter(pk=pk).recalculate_totals()
+
+
+def calculate_totals_on_commit(order):
+    """Recalculate an order's totals once, when the current transaction commits"""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        order.calculate_totals()
+        return
+    # Each save registers its own callback, so a rolled back savepoint or
+    # transaction takes its orders with it. The callbacks of one commit share
+    # a set of the orders already recalculated, so repeated saves of the same
+    # order collapse into one UPDATE. The set only fills while callbacks run,
+    # and a rollback leaves it empty.
+    done = getattr(connection, 'order_totals_done', None)
+    if done is None:
+        done = connection.order_totals_done = set()
+    transaction.on_commit(RecalculateTotals(order, done))
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True)
@@ -39,6 +95,20 @@ class Supplier(models.Model):
         return self.name
 
 
+class ItemQuerySet(models.QuerySet):
+    def with_stock_status(self):
+        """Annotate the values read by Item.is_low_stock/stock_status"""
+        return self.annotate(
+            _is_low_stock=Q(quantity__lte=F('low_stock_threshold')),
+            _stock_status=Case(
+                When(quantity=0, then=Value('Out of Stock')),
+                When(quantity__lte=F('low_stock_threshold'), then=Value('Low Stock')),
+                default=Value('In Stock'),
+                output_field=models.CharField(),
+            )
+        )
+
+
 class Item(models.Model):
     name = models.CharField(max_length=200)
     sku = models.CharField(max_length=50, unique=True, help_text="Stock Keeping Unit")
@@ -51,6 +121,13 @@ class Item(models.Model):
     low_stock_threshold = models.IntegerField(default=10, validators=[MinValueValidator(0)])
     unit_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(Decimal('0.01'))])
 
+    # Stock value, computed and stored by the database so it can be indexed
+    total_value = models.GeneratedField(
+        expression=F('quantity') * F('unit_price'),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
+
     # Status
     is_active = models.BooleanField(default=True)
 
@@ -58,30 +135,71 @@ class Item(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ItemQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['is_active', 'category']),
+            models.Index(
+                F('total_value').desc(),
+                condition=Q(is_active=True),
+                name='item_active_totalvalue_idx',
+            ),
+            models.Index(fields=['quantity'], condition=Q(is_active=True), name='item_active_qty_idx'),
+            models.Index(
+                fields=['low_stock_threshold', 'quantity'],
+                condition=Q(is_active=True),
+                name='item_active_lowstock_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} (SKU: {self.sku})"
 
+    def save(self, *args, **kwargs):
+        updating = not self._state.adding
+        super().save(*args, **kwargs)
+        # The database recomputes total_value on UPDATE without returning it,
+        # so drop the stale value and let the next access reload it
+        if updating:
+            self.__dict__.pop('total_value', None)
+        # Annotated stock values may no longer match the saved quantity
+        self.__dict__.pop('_is_low_stock', None)
+        self.__dict__.pop('_stock_status', None)
+
     @property
     def is_low_stock(self):
         """Check if item is below low stock threshold"""
+        if hasattr(self, '_is_low_stock'):
+            return self._is_low_stock
         return self.quantity <= self.low_stock_threshold
 
     @property
     def stock_status(self):
         """Return stock status as a string"""
-        if self.quantity == 0:
+        if hasattr(self, '_stock_status'):
+            return self._stock_status
+        quantity = self.quantity
+        if quantity == 0:
             return "Out of Stock"
-        elif self.is_low_stock:
+        elif quantity <= self.low_stock_threshold:
             return "Low Stock"
         return "In Stock"
 
-    @property
-    def total_value(self):
-        """Calculate total value of stock"""
-        return self.quantity * self.unit_price
+
+class PurchaseOrderQuerySet(models.QuerySet):
+    def with_totals(self):
+        """Annotate the values read by PurchaseOrder.total_amount/total_items"""
+        return self.annotate(
+            _total_amount=Coalesce(
+                Sum(F('items__quantity') * F('items__unit_price')),
+                Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            ),
+            _total_items=Count('items')
+        )
 
 
 class PurchaseOrder(models.Model):
@@ -105,8 +223,15 @@ class PurchaseOrder(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PurchaseOrderQuerySet.as_manager()
+
     class Meta:
         ordering = ['-order_date', '-created_at']
+        indexes = [
+            models.Index(fields=['-order_date', '-created_at']),
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['status']),
+        ]
 
     def __str__(self):
         supplier_name = self.supplier.name if self.supplier else "No Supplier"
@@ -115,11 +240,21 @@ class PurchaseOrder(models.Model):
     @property
     def total_amount(self):
         """Calculate total amount of purchase order"""
-        return sum(item.subtotal for item in self.items.all())
+        if hasattr(self, '_total_amount'):
+            return self._total_amount
+        return self.items.aggregate(
+            total=Coalesce(
+                Sum(F('quantity') * F('unit_price')),
+                Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )['total']
 
     @property
     def total_items(self):
         """Get total number of items in the order"""
+        if hasattr(self, '_total_items'):
+            return self._total_items
         return self.items.count()
 
 
@@ -134,7 +269,12 @@ class PurchaseOrderItem(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ['purchase_order', 'item']
+        constraints = [
+            models.UniqueConstraint(fields=['purchase_order', 'item'], name='uniq_po_item'),
+        ]
+        indexes = [
+            models.Index(fields=['purchase_order'], include=['quantity', 'unit_price'], name='poitem_po_incl_idx'),
+        ]
 
     def __str__(self):
         return f"{self.item.name} - Qty: {self.quantity}"
@@ -145,6 +285,49 @@ class PurchaseOrderItem(models.Model):
         return self.quantity * self.unit_price
 
 
+class LineItemTotalsQuerySet(models.QuerySet):
+    """Annotations shared by the order models whose lines have a quantity"""
+    quantity_field = 'quantity'
+
+    def with_totals(self):
+        """Annotate the values read by total_items/total_quantity"""
+        return self.annotate(
+            _total_items=Count('items'),
+            _total_quantity=Coalesce(Sum(f'items__{self.quantity_field}'), 0)
+        )
+
+
+class RFQQuerySet(LineItemTotalsQuerySet):
+    quantity_field = 'requested_quantity'
+
+
+class PricedOrderQuerySet(LineItemTotalsQuerySet):
+    """Orders that store subtotal/total_amount computed from their discounted lines"""
+
+    def recalculate_totals(self):
+        """Set subtotal/total_amount from the line items for every row, in one UPDATE"""
+        lines = self.model._meta.get_field('items')
+        subtotal = line_subtotal(lines.related_model, lines.field.name)
+        updated = self.update(
+            subtotal=subtotal,
+            total_amount=subtotal - F('discount') + F('tax') + F('shipping_cost'),
+            updated_at=timezone.now()
+        )
+        if updated:
+            # update() sends no post_save, and the dashboard reads these totals
+            transaction.on_commit(invalidate_dashboard_cache)
+        return updated
+
+
+class QuoteQuerySet(PricedOrderQuerySet):
+    def with_expiry(self):
+        """Annotate the value read by Quote.is_expired, against today's date"""
+        return self.annotate(
+            _is_expired=Q(expiration_date__lt=date.today())
+            & ~Q(status__in=Quote.NON_EXPIRING_STATUSES)
+        )
+
+
 class SalesOrder(models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -188,27 +371,44 @@ class SalesOrder(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PricedOrderQuerySet.as_manager()
+
     class Meta:
         ordering = ['-order_date', '-created_at']
+        indexes = [
+            models.Index(fields=['-order_date', '-created_at']),
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['status', 'order_date']),
+            models.Index(fields=['customer', 'status']),
+            models.Index(
+                fields=['payment_status', 'status'],
+                include=['total_amount'],
+                name='so_payment_status_incl_idx',
+            ),
+            models.Index(fields=['order_date'], include=['total_amount'], name='so_order_date_incl_idx'),
+        ]
 
     def __str__(self):
         return f"SO-{self.order_number} - {self.customer.company_name}"
 
     def calculate_totals(self):
-        """Calculate and update order totals"""
-        self.subtotal = sum(item.subtotal for item in self.items.all())
-        self.total_amount = self.subtotal - self.discount + self.tax + self.shipping_cost
-        self.save()
+        """Calculate and update order totals in a single UPDATE"""
+        SalesOrder.objects.filter(pk=self.pk).recalculate_totals()
+        self.refresh_from_db(fields=['subtotal', 'total_amount', 'updated_at'])
 
     @property
     def total_items(self):
         """Get total number of items in the order"""
+        if hasattr(self, '_total_items'):
+            return self._total_items
         return self.items.count()
 
     @property
     def total_quantity(self):
         """Get total quantity of all items"""
-        return sum(item.quantity for item in self.items.all())
+        if hasattr(self, '_total_quantity'):
+            return self._total_quantity
+        return self.items.aggregate(total=Coalesce(Sum('quantity'), 0))['total']
 
 
 class SalesOrderItem(models.Model):
@@ -223,7 +423,13 @@ class SalesOrderItem(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ['sales_order', 'item']
+        constraints = [
+            models.UniqueConstraint(fields=['sales_order', 'item'], name='uniq_so_item'),
+        ]
+        indexes = [
+            # Covers the per-order SUM/COUNT totals without reading the table
+            models.Index(fields=['sales_order'], include=['quantity', 'unit_price', 'discount'], name='soitem_so_incl_idx'),
+        ]
 
     def __str__(self):
         return f"{self.item.name} - Qty: {self.quantity}"
@@ -236,7 +442,7 @@ class SalesOrderItem(models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         # Update order totals when item is saved
-        self.sales_order.calculate_totals()
+        calculate_totals_on_commit(self.sales_order)
 
 
 class RFQ(models.Model):
@@ -268,10 +474,16 @@ class RFQ(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = RFQQuerySet.as_manager()
+
     class Meta:
         ordering = ['-request_date', '-created_at']
         verbose_name = 'RFQ'
         verbose_name_plural = 'RFQs'
+        indexes = [
+            models.Index(fields=['-request_date', '-created_at']),
+            models.Index(fields=['status']),
+        ]
 
     def __str__(self):
         return f"{self.rfq_number} - {self.customer.company_name}"
@@ -279,12 +491,16 @@ class RFQ(models.Model):
     @property
     def total_items(self):
         """Get total number of different items requested"""
+        if hasattr(self, '_total_items'):
+            return self._total_items
         return self.items.count()
 
     @property
     def total_quantity(self):
         """Get total quantity requested"""
-        return sum(item.requested_quantity for item in self.items.all())
+        if hasattr(self, '_total_quantity'):
+            return self._total_quantity
+        return self.items.aggregate(total=Coalesce(Sum('requested_quantity'), 0))['total']
 
 
 class RFQItem(models.Model):
@@ -299,7 +515,12 @@ class RFQItem(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ['rfq', 'item']
+        constraints = [
+            models.UniqueConstraint(fields=['rfq', 'item'], name='uniq_rfq_item'),
+        ]
+        indexes = [
+            models.Index(fields=['rfq'], include=['requested_quantity'], name='rfqitem_rfq_incl_idx'),
+        ]
 
     def __str__(self):
         return f"{self.item.name} - Qty: {self.requested_quantity}"
@@ -317,6 +538,9 @@ class Quote(models.Model):
         ('converted', 'Converted to Order'),
     ]
 
+    # Statuses for which is_expired is never true
+    NON_EXPIRING_STATUSES = ('accepted', 'converted', 'rejected')
+
     PAYMENT_TERMS_CHOICES = [
         ('net_15', 'Net 15 Days'),
         ('net_30', 'Net 30 Days'),
@@ -362,35 +586,51 @@ class Quote(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = QuoteQuerySet.as_manager()
+
     class Meta:
         ordering = ['-quote_date', '-created_at']
+        indexes = [
+            models.Index(fields=['-quote_date', '-created_at']),
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['status', 'expiration_date']),
+        ]
 
     def __str__(self):
         return f"{self.quote_number} - {self.customer.company_name} (v{self.version})"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # An annotated is_expired may no longer match the saved status/date
+        self.__dict__.pop('_is_expired', None)
+
     @property
     def is_expired(self):
         """Check if quote has expired"""
-        from django.utils import timezone
+        if hasattr(self, '_is_expired'):
+            return self._is_expired
         if not self.expiration_date:
             return False
-        return date.today() > self.expiration_date and self.status not in ['accepted', 'converted', 'rejected']
+        return date.today() > self.expiration_date and self.status not in self.NON_EXPIRING_STATUSES
 
     @property
     def total_items(self):
         """Get total number of items in quote"""
+        if hasattr(self, '_total_items'):
+            return self._total_items
         return self.items.count()
 
     @property
     def total_quantity(self):
         """Get total quantity of all items"""
-        return sum(item.quantity for item in self.items.all())
+        if hasattr(self, '_total_quantity'):
+            return self._total_quantity
+        return self.items.aggregate(total=Coalesce(Sum('quantity'), 0))['total']
 
     def calculate_totals(self):
-        """Calculate and update quote totals"""
-        self.subtotal = sum(item.subtotal for item in self.items.all())
-        self.total_amount = self.subtotal - self.discount + self.tax + self.shipping_cost
-        self.save()
+        """Calculate and update quote totals in a single UPDATE"""
+        Quote.objects.filter(pk=self.pk).recalculate_totals()
+        self.refresh_from_db(fields=['subtotal', 'total_amount', 'updated_at'])
 
 
 class QuoteItem(models.Model):
@@ -407,7 +647,12 @@ class QuoteItem(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        unique_together = ['quote', 'item']
+        constraints = [
+            models.UniqueConstraint(fields=['quote', 'item'], name='uniq_quote_item'),
+        ]
+        indexes = [
+            models.Index(fields=['quote'], include=['quantity', 'unit_price', 'discount'], name='quoteitem_quote_incl_idx'),
+        ]
 
     def __str__(self):
         return f"{self.item.name} - Qty: {self.quantity}"
@@ -420,4 +665,4 @@ class QuoteItem(models.Model):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         # Update quote totals when item is saved
-        self.quote.calculate_totals()
+        calculate_totals_on_commit(self.quote)
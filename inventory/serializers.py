@@ -14,6 +14,9 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
     def get_items_count(self, obj):
+        # Annotated by the viewset; freshly created/updated rows fall back to a COUNT
+        if hasattr(obj, 'items_count'):
+            return obj.items_count
         return obj.items.count()
 
 
@@ -26,6 +29,9 @@ class SupplierSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
     def get_items_count(self, obj):
+        # Annotated by the viewset; freshly created/updated rows fall back to a COUNT
+        if hasattr(obj, 'items_count'):
+            return obj.items_count
         return obj.items.count()
 
 
@@ -153,7 +159,7 @@ class SalesOrderItemSerializer(serializers.ModelSerializer):
 class SalesOrderSerializer(serializers.ModelSerializer):
     customer_name = serializers.CharField(source='customer.company_name', read_only=True)
     contact_name = serializers.CharField(source='contact.full_name', read_only=True)
-    items = SalesOrderItemSerializer(many=True, read_only=True)
+    items = serializers.SerializerMethodField()
     total_items = serializers.IntegerField(read_only=True)
     total_quantity = serializers.IntegerField(read_only=True)
 
@@ -174,6 +180,12 @@ class SalesOrderSerializer(serializers.ModelSerializer):
         """Ensure order number is uppercase"""
         return value.upper()
 
+    def get_items(self, obj):
+        # Built by PostgreSQL when the view annotates items_json
+        if hasattr(obj, 'items_json'):
+            return obj.items_json
+        return SalesOrderItemSerializer(obj.items.all(), many=True).data
+
 
 class SalesOrderListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for list views"""
@@ -1,3 +1,267 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
 from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from crm.models import Customer
+from .models import (
+    Item, PurchaseOrder, PurchaseOrderItem, Quote, QuoteItem, SalesOrder, SalesOrderItem, Supplier
+)
+from .serializers import SalesOrderItemSerializer
+
+
+class OrderTotalsOnCommitTests(TestCase):
+    """Line saves recalculate their order's totals once, at commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(company_name='Acme')
+        cls.widget = Item.objects.create(name='Widget', sku='W-1', quantity=10, unit_price=Decimal('5.00'))
+        cls.gadget = Item.objects.create(name='Gadget', sku='G-1', quantity=10, unit_price=Decimal('7.50'))
+
+    def create_order(self, number):
+        return SalesOrder.objects.create(order_number=number, customer=self.customer)
+
+    def add_line(self, order, item, quantity):
+        return SalesOrderItem.objects.create(
+            sales_order=order, item=item, quantity=quantity, unit_price=item.unit_price
+        )
+
+    def test_repeated_saves_recalculate_once(self):
+        order = self.create_order('SO-1')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.add_line(order, self.widget, 2)
+            self.add_line(order, self.gadget, 1)
+        self.assertEqual(len(callbacks), 2)
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal('17.50'))
+        self.assertEqual(order.total_amount, Decimal('17.50'))
+
+    def test_rolled_back_savepoint_is_not_recalculated(self):
+        kept, rolled_back = self.create_order('SO-1'), self.create_order('SO-2')
+        SalesOrder.objects.filter(pk=rolled_back.pk).update(subtotal=Decimal('99.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.add_line(rolled_back, self.widget, 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.add_line(kept, self.widget, 3)
+        kept.refresh_from_db()
+        rolled_back.refresh_from_db()
+        self.assertEqual(kept.subtotal, Decimal('15.00'))
+        self.assertEqual(rolled_back.subtotal, Decimal('99.00'))
+
+    def test_next_commit_starts_afresh(self):
+        order = self.create_order('SO-1')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_line(order, self.widget, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_line(order, self.gadget, 2)
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal('20.00'))
+
+
+class QuoteConversionTests(APITestCase):
+    """convert_to_order works from the locked quote and its current lines"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.customer = Customer.objects.create(company_name='Acme')
+        cls.widget = Item.objects.create(name='Widget', sku='W-1', quantity=10, unit_price=Decimal('5.00'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.quote = Quote.objects.create(quote_number='Q-1', customer=self.customer, status='accepted')
+        QuoteItem.objects.create(quote=self.quote, item=self.widget, quantity=4, unit_price=Decimal('5.00'))
+
+    def convert(self, order_number):
+        return self.client.post(
+            f'/api/inventory/quotes/{self.quote.pk}/convert_to_order/', {'order_number': order_number}
+        )
+
+    def test_converts_once(self):
+        response = self.convert('so-1')
+        self.assertEqual(response.status_code, 201)
+        order = SalesOrder.objects.get()
+        self.assertEqual(order.order_number, 'SO-1')
+        self.assertEqual(order.subtotal, Decimal('20.00'))
+        self.assertEqual(list(order.items.values_list('item_id', 'quantity')), [(self.widget.pk, 4)])
+        self.quote.refresh_from_db()
+        self.assertEqual((self.quote.status, self.quote.sales_order_id), ('converted', order.pk))
+
+        response = self.convert('so-2')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(SalesOrder.objects.count(), 1)
+
+    def test_insufficient_stock(self):
+        Item.objects.filter(pk=self.widget.pk).update(quantity=3)
+        response = self.convert('so-1')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['items'], [{'item': 'Widget', 'required': 4, 'available': 3}])
+        self.assertFalse(SalesOrder.objects.exists())
+
+
+class SalesOrderRetrieveTests(APITestCase):
+    """The lines built by PostgreSQL match SalesOrderItemSerializer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.customer = Customer.objects.create(company_name='Acme')
+        cls.order = SalesOrder.objects.create(order_number='SO-1', customer=cls.customer)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def retrieve_items(self):
+        response = self.client.get(f'/api/inventory/sales-orders/{self.order.pk}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['items']
+
+    def test_lines_match_serializer(self):
+        widget = Item.objects.create(name='Widget', sku='W-1', quantity=10, unit_price=Decimal('5.00'))
+        gadget = Item.objects.create(name='Gadget', sku='G-1', quantity=10, unit_price=Decimal('7.50'))
+        SalesOrderItem.objects.bulk_create([
+            SalesOrderItem(sales_order=self.order, item=widget, quantity=3,
+                           unit_price=Decimal('4.99'), discount=Decimal('1.50')),
+            SalesOrderItem(sales_order=self.order, item=gadget, quantity=1, unit_price=Decimal('7.50')),
+        ])
+        expected = SalesOrderItemSerializer(self.order.items.order_by('id'), many=True).data
+        self.assertEqual(self.retrieve_items(), [dict(line) for line in expected])
+
+    def test_order_without_lines(self):
+        self.assertEqual(self.retrieve_items(), [])
+
+
+class OrderStockTests(APITestCase):
+    """Confirming, cancelling and receiving orders move stock exactly once"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.customer = Customer.objects.create(company_name='Acme')
+        cls.supplier = Supplier.objects.create(name='Parts Co')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.widget = Item.objects.create(name='Widget', sku='W-1', quantity=10, unit_price=Decimal('5.00'))
+        self.gadget = Item.objects.create(name='Gadget', sku='G-1', quantity=4, unit_price=Decimal('7.50'))
+        self.order = SalesOrder.objects.create(order_number='SO-1', customer=self.customer)
+        SalesOrderItem.objects.bulk_create([
+            SalesOrderItem(sales_order=self.order, item=self.widget, quantity=3, unit_price=Decimal('5.00')),
+            SalesOrderItem(sales_order=self.order, item=self.gadget, quantity=4, unit_price=Decimal('7.50')),
+        ])
+
+    def sales_action(self, action):
+        return self.client.post(f'/api/inventory/sales-orders/{self.order.pk}/{action}/')
+
+    def assert_stock(self, widget, gadget):
+        self.assertEqual(
+            dict(Item.objects.values_list('sku', 'quantity')), {'W-1': widget, 'G-1': gadget}
+        )
+
+    def test_confirm_deducts_once(self):
+        self.assertEqual(self.sales_action('confirm_order').status_code, 200)
+        self.assert_stock(7, 0)
+        self.assertEqual(self.sales_action('confirm_order').status_code, 400)
+        self.assert_stock(7, 0)
+
+    def test_confirm_with_insufficient_stock(self):
+        Item.objects.filter(pk=self.gadget.pk).update(quantity=2)
+        response = self.sales_action('confirm_order')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['items'], [{'item': 'Gadget', 'required': 4, 'available': 2}])
+        self.assert_stock(10, 2)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'draft')
+
+    def test_cancel_confirmed_restores_once(self):
+        self.sales_action('confirm_order')
+        self.assertEqual(self.sales_action('cancel_order').status_code, 200)
+        self.assert_stock(10, 4)
+        self.assertEqual(self.sales_action('cancel_order').status_code, 400)
+        self.assert_stock(10, 4)
+
+    def test_cancel_draft_leaves_stock(self):
+        self.assertEqual(self.sales_action('cancel_order').status_code, 200)
+        self.assert_stock(10, 4)
+
+    def test_receive_adds_once(self):
+        purchase_order = PurchaseOrder.objects.create(order_number='PO-1', supplier=self.supplier, status='approved')
+        PurchaseOrderItem.objects.create(
+            purchase_order=purchase_order, item=self.widget, quantity=5, unit_price=Decimal('4.00')
+        )
+        url = f'/api/inventory/purchase-orders/{purchase_order.pk}/receive_order/'
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assert_stock(15, 4)
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assert_stock(15, 4)
+
+
+class SalesOrderBulkCreateTests(APITestCase):
+    """POST /sales-orders/bulk/ validates everything before writing anything"""
+
+    url = '/api/inventory/sales-orders/bulk/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.customer = Customer.objects.create(company_name='Acme')
+        cls.widget = Item.objects.create(name='Widget', sku='W-1', quantity=10, unit_price=Decimal('5.00'))
+        cls.gadget = Item.objects.create(name='Gadget', sku='G-1', quantity=10, unit_price=Decimal('7.50'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def order(self, number, *lines):
+        return {
+            'order_number': number,
+            'customer': self.customer.pk,
+            'items': [
+                {'item': item.pk, 'quantity': quantity, 'unit_price': str(item.unit_price)}
+                for item, quantity in lines
+            ],
+        }
+
+    def assert_rejected(self, payload):
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SalesOrder.objects.exists())
+        return response
+
+    def test_creates_orders_with_totals(self):
+        response = self.client.post(self.url, [
+            self.order('so-1', (self.widget, 2), (self.gadget, 1)),
+            self.order('so-2', (self.gadget, 4)),
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            dict(SalesOrder.objects.values_list('order_number', 'total_amount')),
+            {'SO-1': Decimal('17.50'), 'SO-2': Decimal('30.00')}
+        )
+        self.assertEqual(SalesOrderItem.objects.count(), 3)
+
+    def test_rejects_non_list(self):
+        self.assert_rejected(self.order('so-1', (self.widget, 1)))
+
+    def test_rejects_invalid_line(self):
+        response = self.assert_rejected([
+            self.order('so-1', (self.widget, 1)),
+            self.order('so-2', (self.widget, 11)),
+        ])
+        self.assertEqual(response.data['items'][0], [])
+        self.assertIn('quantity', response.data['items'][1][0])
+
+    def test_rejects_repeated_order_number(self):
+        self.assert_rejected([self.order('so-1', (self.widget, 1)), self.order('SO-1', (self.gadget, 1))])
 
-# Create your tests here.
+    def test_rejects_repeated_item(self):
+        self.assert_rejected([self.order('so-1', (self.widget, 1), (self.widget, 2))])
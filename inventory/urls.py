@@ -1,5 +1,5 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import (
     CategoryViewSet,
     SupplierViewSet,
@@ -14,18 +14,21 @@ from .views import (
     QuoteItemViewSet
 )
 
-router = DefaultRouter()
-router.register(r'categories', CategoryViewSet, basename='category')
-router.register(r'suppliers', SupplierViewSet, basename='supplier')
+# SimpleRouter: the project-level api_root already lists the endpoints, so the
+# per-app root view and the .json/.api format-suffix duplicates are not needed
+router = SimpleRouter()
+# Busiest resources first; the resolver tries patterns in order
 router.register(r'items', ItemViewSet, basename='item')
-router.register(r'purchase-orders', PurchaseOrderViewSet, basename='purchaseorder')
-router.register(r'purchase-order-items', PurchaseOrderItemViewSet, basename='purchaseorderitem')
 router.register(r'sales-orders', SalesOrderViewSet, basename='salesorder')
 router.register(r'sales-order-items', SalesOrderItemViewSet, basename='salesorderitem')
-router.register(r'rfqs', RFQViewSet, basename='rfq')
-router.register(r'rfq-items', RFQItemViewSet, basename='rfqitem')
+router.register(r'purchase-orders', PurchaseOrderViewSet, basename='purchaseorder')
+router.register(r'purchase-order-items', PurchaseOrderItemViewSet, basename='purchaseorderitem')
 router.register(r'quotes', QuoteViewSet, basename='quote')
 router.register(r'quote-items', QuoteItemViewSet, basename='quoteitem')
+router.register(r'rfqs', RFQViewSet, basename='rfq')
+router.register(r'rfq-items', RFQItemViewSet, basename='rfqitem')
+router.register(r'categories', CategoryViewSet, basename='category')
+router.register(r'suppliers', SupplierViewSet, basename='supplier')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -2,8 +2,16 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Count, F, IntegerField, JSONField, Prefetch, Q, Value, When
+from django.db.models.functions import Cast, JSONObject
+from django.utils import timezone
+from collections import defaultdict
 from datetime import datetime, timedelta
-from ozed_tech_project.export_utils import CSVExporter, ExcelExporter, PDFExporter
+from ozed_tech_project.export_utils import CSVExporter, ExcelExporter, PDFExporter, export_filename
+from ozed_tech_project.pagination import KeysetPagination
+from dashboard.cache import invalidate_dashboard_cache
 from .models import (
     Category, Supplier, Item, PurchaseOrder, PurchaseOrderItem,
     SalesOrder, SalesOrderItem, RFQ, RFQItem, Quote, QuoteItem
@@ -28,11 +36,54 @@ from .serializers import (
 )
 
 
+def lock_stock(lines):
+    """Lock the Item rows referenced by order lines, keyed by pk (call inside atomic())"""
+    items = Item.objects.select_for_update().filter(
+        pk__in=[line.item_id for line in lines]
+    ).only('id', 'name', 'quantity').order_by('pk')
+    return {item.pk: item for item in items}
+
+
+def shift_stock(lines, sign=1):
+    """Add (sign=1) or remove (sign=-1) order line quantities from stock in one UPDATE"""
+    deltas = defaultdict(int)
+    for line in lines:
+        deltas[line.item_id] += sign * line.quantity
+    if not deltas:
+        return
+    Item.objects.filter(pk__in=deltas).update(
+        quantity=F('quantity') + Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            output_field=IntegerField()
+        ),
+        updated_at=timezone.now()
+    )
+
+
+# Valid change_status targets, built once rather than per request
+PURCHASE_ORDER_STATUSES = frozenset(code for code, _ in PurchaseOrder.STATUS_CHOICES)
+SALES_ORDER_STATUSES = frozenset(code for code, _ in SalesOrder.STATUS_CHOICES)
+
+# Columns read by the item CSV/Excel exports, in output order
+ITEM_EXPORT_FIELDS = [
+    'sku', 'name', 'category__name', 'supplier__name', 'quantity', 'unit_price',
+    'low_stock_threshold', '_stock_status', 'total_value', 'is_active'
+]
+
+# Columns read by the sales order CSV/Excel exports, in output order
+SALES_ORDER_EXPORT_FIELDS = [
+    'order_number', 'customer__company_name', 'order_date', 'expected_delivery_date',
+    'status', 'payment_status', 'subtotal', 'discount', 'tax', 'shipping_cost', 'total_amount'
+]
+SALES_ORDER_STATUS_DISPLAY = dict(SalesOrder.STATUS_CHOICES)
+PAYMENT_STATUS_DISPLAY = dict(SalesOrder.PAYMENT_STATUS_CHOICES)
+
+
 class CategoryViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing product categories
     """
-    queryset = Category.objects.all()
+    queryset = Category.objects.annotate(items_count=Count('items'))
     serializer_class = CategorySerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'description']
@@ -43,7 +94,7 @@ class SupplierViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing suppliers
     """
-    queryset = Supplier.objects.all()
+    queryset = Supplier.objects.annotate(items_count=Count('items'))
     serializer_class = SupplierSerializer
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'contact_person', 'email']
@@ -59,6 +110,21 @@ class ItemViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'sku', 'description']
     ordering_fields = ['name', 'created_at', 'quantity', 'unit_price']
     filterset_fields = ['category', 'supplier', 'is_active']
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Compute stock status in the database rather than per serialized row"""
+        if self.action in ['list', 'low_stock', 'out_of_stock']:
+            # Only the columns ItemListSerializer reads
+            return Item.objects.select_related('category').only(
+                'id', 'name', 'sku', 'category__name', 'quantity', 'unit_price', 'is_active',
+                'created_at'
+            ).with_stock_status()
+        if self.action in ['export_csv', 'export_excel']:
+            # Rows are read with values_list(*ITEM_EXPORT_FIELDS), which joins
+            # category/supplier and selects only those columns itself
+            return Item.objects.with_stock_status()
+        return Item.objects.select_related('category', 'supplier').with_stock_status()
 
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
@@ -69,16 +135,26 @@ class ItemViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def low_stock(self, request):
         """Get items that are low on stock"""
-        low_stock_items = [item for item in self.queryset if item.is_low_stock]
+        low_stock_items = self.filter_queryset(self.get_queryset()).filter(_is_low_stock=True)
+        page = self.paginate_queryset(low_stock_items)
+        if page is not None:
+            serializer = ItemListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = ItemListSerializer(low_stock_items, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def out_of_stock(self, request):
         """Get items that are out of stock"""
-        out_of_stock_items = self.queryset.filter(quantity=0)
-        serializer = ItemListSerializer(out_of_stock_items, many=True)
-        return Response(serializer.data)
+        # Plain rows in the ItemListSerializer shape, skipping the per-field serializer pass
+        out_of_stock_items = list(self.get_queryset().filter(quantity=0).values(
+            'id', 'name', 'sku', 'quantity', 'unit_price', 'is_active',
+            category_name=F('category__name'), stock_status=F('_stock_status')
+        ))
+        for item in out_of_stock_items:
+            # DRF renders decimals as strings
+            item['unit_price'] = str(item['unit_price'])
+        return Response(out_of_stock_items)
 
     @action(detail=True, methods=['post'])
     def adjust_stock(self, request, pk=None):
@@ -94,17 +170,23 @@ class ItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        new_quantity = item.quantity + adjustment
+        # Apply the adjustment relative to the stored quantity so concurrent
+        # adjustments cannot overwrite each other; the guard keeps it >= 0
+        updated = Item.objects.filter(
+            pk=item.pk, quantity__gte=max(-adjustment, 0)
+        ).update(quantity=F('quantity') + adjustment, updated_at=timezone.now())
 
-        if new_quantity < 0:
+        if not updated:
             return Response(
                 {'error': 'Cannot reduce stock below zero'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        item.quantity = new_quantity
-        item.save()
+        # update() sends no post_save
+        transaction.on_commit(invalidate_dashboard_cache)
 
+        # Reload with the recomputed total_value and stock status annotations
+        item = self.get_queryset().get(pk=item.pk)
         serializer = ItemSerializer(item)
         return Response(serializer.data)
 
@@ -116,23 +198,25 @@ class ItemViewSet(viewsets.ModelViewSet):
         headers = ['SKU', 'Name', 'Category', 'Supplier', 'Quantity', 'Unit Price',
                   'Low Stock Threshold', 'Stock Status', 'Total Value', 'Active']
 
-        rows = []
-        for item in items:
-            rows.append([
-                item.sku or 'N/A',
-                item.name,
-                item.category.name if item.category else 'N/A',
-                item.supplier.name if item.supplier else 'N/A',
-                item.quantity,
-                f'{item.unit_price:.2f}',
-                item.low_stock_threshold,
-                item.stock_status,
-                f'{item.total_value:.2f}',
-                'Yes' if item.is_active else 'No'
-            ])
-
-        filename = f'inventory_items_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        return CSVExporter.export_to_csv(filename, headers, rows)
+        def rows():
+            for (sku, name, category, supplier, quantity, unit_price, low_stock_threshold,
+                 stock_status, total_value, is_active) in items.values_list(
+                    *ITEM_EXPORT_FIELDS).iterator(chunk_size=2000):
+                yield [
+                    sku or 'N/A',
+                    name,
+                    category or 'N/A',
+                    supplier or 'N/A',
+                    quantity,
+                    f'{unit_price:.2f}',
+                    low_stock_threshold,
+                    stock_status,
+                    f'{total_value:.2f}',
+                    'Yes' if is_active else 'No'
+                ]
+
+        filename = export_filename('inventory_items', request.user, 'csv')
+        return CSVExporter.stream_to_csv(filename, headers, rows())
 
     @action(detail=False, methods=['get'])
     def export_excel(self, request):
@@ -143,21 +227,23 @@ class ItemViewSet(viewsets.ModelViewSet):
                   'Low Stock Threshold', 'Stock Status', 'Total Value', 'Active']
 
         rows = []
-        for item in items:
+        for (sku, name, category, supplier, quantity, unit_price, low_stock_threshold,
+             stock_status, total_value, is_active) in items.values_list(
+                *ITEM_EXPORT_FIELDS).iterator(chunk_size=2000):
             rows.append([
-                item.sku or 'N/A',
-                item.name,
-                item.category.name if item.category else 'N/A',
-                item.supplier.name if item.supplier else 'N/A',
-                item.quantity,
-                float(item.unit_price),
-                item.low_stock_threshold,
-                item.stock_status,
-                float(item.total_value),
-                'Yes' if item.is_active else 'No'
+                sku or 'N/A',
+                name,
+                category or 'N/A',
+                supplier or 'N/A',
+                quantity,
+                float(unit_price),
+                low_stock_threshold,
+                stock_status,
+                float(total_value),
+                'Yes' if is_active else 'No'
             ])
 
-        filename = f'inventory_items_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        filename = export_filename('inventory_items', request.user, 'xlsx')
         return ExcelExporter.export_to_excel(filename, 'Inventory Items', headers, rows)
 
 
@@ -165,11 +251,26 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing purchase orders
     """
-    queryset = PurchaseOrder.objects.select_related('supplier').prefetch_related('items__item').all()
+    queryset = PurchaseOrder.objects.select_related('supplier').with_totals()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['order_number', 'supplier__name', 'notes']
     ordering_fields = ['order_date', 'created_at', 'status']
     filterset_fields = ['supplier', 'status']
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Trim list columns; prefetch joined line items for single-object actions"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the columns PurchaseOrderListSerializer reads
+            queryset = queryset.select_related(None).select_related('supplier').only(
+                'id', 'order_number', 'supplier__name', 'order_date', 'status', 'created_at'
+            )
+        elif self.detail:
+            queryset = queryset.prefetch_related(
+                Prefetch('items', queryset=PurchaseOrderItem.objects.select_related('item'))
+            )
+        return queryset
 
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
@@ -200,7 +301,7 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         purchase_order = self.get_object()
         new_status = request.data.get('status')
 
-        if new_status not in dict(PurchaseOrder.STATUS_CHOICES):
+        if new_status not in PURCHASE_ORDER_STATUSES:
             return Response(
                 {'error': 'Invalid status'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -217,25 +318,30 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         """Mark order as received and update inventory quantities"""
         purchase_order = self.get_object()
 
-        if purchase_order.status == 'received':
-            return Response(
-                {'error': 'Order already received'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        with transaction.atomic():
+            # Lock the order and re-read its status so concurrent receives
+            # cannot both add the quantities
+            purchase_order.status = PurchaseOrder.objects.select_for_update().values_list(
+                'status', flat=True
+            ).get(pk=purchase_order.pk)
 
-        if purchase_order.status not in ['approved', 'pending']:
-            return Response(
-                {'error': 'Can only receive approved or pending orders'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            if purchase_order.status == 'received':
+                return Response(
+                    {'error': 'Order already received'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-        # Update inventory quantities
-        for po_item in purchase_order.items.all():
-            po_item.item.quantity += po_item.quantity
-            po_item.item.save()
+            if purchase_order.status not in ['approved', 'pending']:
+                return Response(
+                    {'error': 'Can only receive approved or pending orders'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-        purchase_order.status = 'received'
-        purchase_order.save()
+            # Update inventory quantities
+            shift_stock(PurchaseOrderItem.objects.filter(purchase_order=purchase_order))
+
+            purchase_order.status = 'received'
+            purchase_order.save()
 
         serializer = PurchaseOrderSerializer(purchase_order)
         return Response(serializer.data)
@@ -255,11 +361,55 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing sales orders
     """
-    queryset = SalesOrder.objects.select_related('customer', 'contact').prefetch_related('items__item').all()
+    queryset = SalesOrder.objects.select_related('customer', 'contact').with_totals()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['order_number', 'customer__company_name', 'notes']
     ordering_fields = ['order_date', 'created_at', 'status', 'total_amount']
     filterset_fields = ['customer', 'status', 'payment_status']
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Trim list columns; prefetch joined line items for single-object actions"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the columns SalesOrderListSerializer reads
+            queryset = queryset.select_related(None).select_related('customer').only(
+                'id', 'order_number', 'customer__company_name', 'order_date',
+                'status', 'payment_status', 'total_amount', 'created_at'
+            )
+        elif self.action in ['export_csv', 'export_excel']:
+            # Rows are read with values_list(*SALES_ORDER_EXPORT_FIELDS); the
+            # line totals would only add a GROUP BY
+            queryset = SalesOrder.objects.all()
+        elif self.action == 'retrieve' and connection.vendor == 'postgresql':
+            # Build the nested lines in the database; decimals are cast to text
+            # to match SalesOrderItemSerializer's string output
+            queryset = queryset.annotate(items_json=JSONBAgg(
+                JSONObject(
+                    id='items__id',
+                    item='items__item_id',
+                    item_name='items__item__name',
+                    item_sku='items__item__sku',
+                    quantity='items__quantity',
+                    unit_price=Cast('items__unit_price', CharField()),
+                    discount=Cast('items__discount', CharField()),
+                    subtotal=Cast(
+                        F('items__quantity') * F('items__unit_price') - F('items__discount'),
+                        CharField()
+                    ),
+                ),
+                filter=Q(items__isnull=False),
+                order_by='items__id',
+                default=Value([], JSONField())
+            ))
+        elif self.detail:
+            # Line serializers and the invoice only read the item's name/sku,
+            # so leave the free-text description out of the join
+            queryset = queryset.prefetch_related(Prefetch(
+                'items',
+                queryset=SalesOrderItem.objects.select_related('item').defer('item__description')
+            ))
+        return queryset
 
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
@@ -267,6 +417,66 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
             return SalesOrderListSerializer
         return SalesOrderSerializer
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Create a list of sales orders, each with its "items", in one transaction"""
+        if not isinstance(request.data, list):
+            return Response(
+                {'error': 'Expected a list of sales orders'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        order_serializer = SalesOrderSerializer(data=request.data, many=True)
+        line_serializers = [
+            SalesOrderItemSerializer(data=order.get('items', []) if isinstance(order, dict) else [], many=True)
+            for order in request.data
+        ]
+        orders_valid = order_serializer.is_valid()
+        line_errors = [
+            serializer.errors if not serializer.is_valid() else []
+            for serializer in line_serializers
+        ]
+        if not orders_valid or any(line_errors):
+            return Response(
+                {'orders': order_serializer.errors if not orders_valid else [], 'items': line_errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # The unique validator only checks order numbers already in the database
+        order_numbers = [data['order_number'] for data in order_serializer.validated_data]
+        if len(order_numbers) != len(set(order_numbers)):
+            return Response(
+                {'error': 'The same order number is used more than once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        for index, serializer in enumerate(line_serializers):
+            item_ids = [line['item'].pk for line in serializer.validated_data]
+            if len(item_ids) != len(set(item_ids)):
+                return Response(
+                    {'error': f'Order {index} lists the same item more than once'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        with transaction.atomic():
+            # PostgreSQL returns the new primary keys, so the lines can reference them
+            orders = SalesOrder.objects.bulk_create(
+                [SalesOrder(**data) for data in order_serializer.validated_data]
+            )
+            SalesOrderItem.objects.bulk_create([
+                SalesOrderItem(sales_order=order, **line)
+                for order, serializer in zip(orders, line_serializers)
+                for line in serializer.validated_data
+            ])
+
+            # bulk_create() skips SalesOrderItem.save(); set every order's totals in one UPDATE
+            order_ids = [order.pk for order in orders]
+            SalesOrder.objects.filter(pk__in=order_ids).recalculate_totals()
+
+        created = SalesOrder.objects.filter(pk__in=order_ids).select_related('customer').with_totals()
+        serializer = SalesOrderListSerializer(created, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=['post'])
     def add_item(self, request, pk=None):
         """Add an item to the sales order"""
@@ -290,7 +500,7 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
         sales_order = self.get_object()
         new_status = request.data.get('status')
 
-        if new_status not in dict(SalesOrder.STATUS_CHOICES):
+        if new_status not in SALES_ORDER_STATUSES:
             return Response(
                 {'error': 'Invalid status'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -307,35 +517,45 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
         """Confirm order and deduct inventory"""
         sales_order = self.get_object()
 
-        if sales_order.status != 'draft':
-            return Response(
-                {'error': 'Can only confirm draft orders'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Check stock availability for all items
-        insufficient_items = []
-        for order_item in sales_order.items.all():
-            if order_item.item.quantity < order_item.quantity:
-                insufficient_items.append({
-                    'item': order_item.item.name,
-                    'required': order_item.quantity,
-                    'available': order_item.item.quantity
-                })
-
-        if insufficient_items:
-            return Response(
-                {'error': 'Insufficient stock', 'items': insufficient_items},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Deduct inventory
-        for order_item in sales_order.items.all():
-            order_item.item.quantity -= order_item.quantity
-            order_item.item.save()
-
-        sales_order.status = 'confirmed'
-        sales_order.save()
+        with transaction.atomic():
+            # Lock the order and re-read its status so concurrent confirms
+            # cannot both deduct stock
+            sales_order.status = SalesOrder.objects.select_for_update().values_list(
+                'status', flat=True
+            ).get(pk=sales_order.pk)
+
+            if sales_order.status != 'draft':
+                return Response(
+                    {'error': 'Can only confirm draft orders'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Read the lines under the lock, not from the prefetch made before it
+            lines = list(SalesOrderItem.objects.filter(sales_order=sales_order))
+            stock = lock_stock(lines)
+
+            # Check stock availability for all items
+            insufficient_items = []
+            for order_item in lines:
+                item = stock[order_item.item_id]
+                if item.quantity < order_item.quantity:
+                    insufficient_items.append({
+                        'item': item.name,
+                        'required': order_item.quantity,
+                        'available': item.quantity
+                    })
+
+            if insufficient_items:
+                return Response(
+                    {'error': 'Insufficient stock', 'items': insufficient_items},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Deduct inventory; the rows stay locked until commit
+            shift_stock(lines, sign=-1)
+
+            sales_order.status = 'confirmed'
+            sales_order.save()
 
         serializer = SalesOrderSerializer(sales_order)
         return Response(serializer.data)
@@ -381,20 +601,25 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
         """Cancel order and restore inventory if confirmed"""
         sales_order = self.get_object()
 
-        if sales_order.status in ['delivered', 'cancelled']:
-            return Response(
-                {'error': 'Cannot cancel delivered or already cancelled orders'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        with transaction.atomic():
+            # Lock the order and re-read its status so concurrent cancels
+            # cannot both restore stock
+            sales_order.status = SalesOrder.objects.select_for_update().values_list(
+                'status', flat=True
+            ).get(pk=sales_order.pk)
 
-        # Restore inventory if order was confirmed
-        if sales_order.status in ['confirmed', 'processing', 'shipped']:
-            for order_item in sales_order.items.all():
-                order_item.item.quantity += order_item.quantity
-                order_item.item.save()
+            if sales_order.status in ['delivered', 'cancelled']:
+                return Response(
+                    {'error': 'Cannot cancel delivered or already cancelled orders'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-        sales_order.status = 'cancelled'
-        sales_order.save()
+            # Restore inventory if order was confirmed
+            if sales_order.status in ['confirmed', 'processing', 'shipped']:
+                shift_stock(SalesOrderItem.objects.filter(sales_order=sales_order))
+
+            sales_order.status = 'cancelled'
+            sales_order.save()
 
         serializer = SalesOrderSerializer(sales_order)
         return Response(serializer.data)
@@ -408,24 +633,27 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
                   'Status', 'Payment Status', 'Subtotal', 'Discount', 'Tax',
                   'Shipping', 'Total Amount']
 
-        rows = []
-        for order in orders:
-            rows.append([
-                order.order_number,
-                order.customer.company_name,
-                order.order_date.strftime('%Y-%m-%d'),
-                order.expected_delivery_date.strftime('%Y-%m-%d') if order.expected_delivery_date else 'N/A',
-                order.get_status_display(),
-                order.get_payment_status_display(),
-                f'{order.subtotal:.2f}',
-                f'{order.discount:.2f}',
-                f'{order.tax:.2f}',
-                f'{order.shipping_cost:.2f}',
-                f'{order.total_amount:.2f}'
-            ])
-
-        filename = f'sales_orders_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        return CSVExporter.export_to_csv(filename, headers, rows)
+        def rows():
+            for (order_number, company_name, order_date, expected_delivery_date, status_code,
+                 payment_status, subtotal, discount, tax, shipping_cost,
+                 total_amount) in orders.values_list(
+                    *SALES_ORDER_EXPORT_FIELDS).iterator(chunk_size=2000):
+                yield [
+                    order_number,
+                    company_name,
+                    order_date.strftime('%Y-%m-%d'),
+                    expected_delivery_date.strftime('%Y-%m-%d') if expected_delivery_date else 'N/A',
+                    SALES_ORDER_STATUS_DISPLAY.get(status_code, status_code),
+                    PAYMENT_STATUS_DISPLAY.get(payment_status, payment_status),
+                    f'{subtotal:.2f}',
+                    f'{discount:.2f}',
+                    f'{tax:.2f}',
+                    f'{shipping_cost:.2f}',
+                    f'{total_amount:.2f}'
+                ]
+
+        filename = export_filename('sales_orders', request.user, 'csv')
+        return CSVExporter.stream_to_csv(filename, headers, rows())
 
     @action(detail=False, methods=['get'])
     def export_excel(self, request):
@@ -437,22 +665,25 @@ class SalesOrderViewSet(viewsets.ModelViewSet):
                   'Shipping', 'Total Amount']
 
         rows = []
-        for order in orders:
+        for (order_number, company_name, order_date, expected_delivery_date, status_code,
+             payment_status, subtotal, discount, tax, shipping_cost,
+             total_amount) in orders.values_list(
+                *SALES_ORDER_EXPORT_FIELDS).iterator(chunk_size=2000):
             rows.append([
-                order.order_number,
-                order.customer.company_name,
-                order.order_date.strftime('%Y-%m-%d'),
-                order.expected_delivery_date.strftime('%Y-%m-%d') if order.expected_delivery_date else 'N/A',
-                order.get_status_display(),
-                order.get_payment_status_display(),
-                float(order.subtotal),
-                float(order.discount),
-                float(order.tax),
-                float(order.shipping_cost),
-                float(order.total_amount)
+                order_number,
+                company_name,
+                order_date.strftime('%Y-%m-%d'),
+                expected_delivery_date.strftime('%Y-%m-%d') if expected_delivery_date else 'N/A',
+                SALES_ORDER_STATUS_DISPLAY.get(status_code, status_code),
+                PAYMENT_STATUS_DISPLAY.get(payment_status, payment_status),
+                float(subtotal),
+                float(discount),
+                float(tax),
+                float(shipping_cost),
+                float(total_amount)
             ])
 
-        filename = f'sales_orders_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        filename = export_filename('sales_orders', request.user, 'xlsx')
         return ExcelExporter.export_to_excel(filename, 'Sales Orders', headers, rows)
 
     @action(detail=True, methods=['get'])
@@ -476,12 +707,27 @@ class RFQViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing RFQs (Requests for Quote)
     """
-    queryset = RFQ.objects.select_related('customer', 'contact', 'requested_by').prefetch_related('items__item').all()
+    queryset = RFQ.objects.select_related('customer', 'contact', 'requested_by').with_totals()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['rfq_number', 'customer__company_name', 'notes']
     ordering_fields = ['request_date', 'required_by_date', 'created_at']
     filterset_fields = ['status', 'customer', 'requested_by']
 
+    def get_queryset(self):
+        """Trim list columns; prefetch joined line items for single-object actions"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the columns RFQListSerializer reads
+            queryset = queryset.select_related(None).select_related('customer').only(
+                'id', 'rfq_number', 'customer__company_name', 'request_date',
+                'required_by_date', 'status'
+            )
+        elif self.detail:
+            queryset = queryset.prefetch_related(
+                Prefetch('items', queryset=RFQItem.objects.select_related('item'))
+            )
+        return queryset
+
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
         if self.action == 'list':
@@ -568,33 +814,37 @@ class RFQViewSet(viewsets.ModelViewSet):
 
         # Create quote
         expiration_days = int(request.data.get('expiration_days', 30))
-        quote = Quote.objects.create(
-            quote_number=quote_number.upper(),
-            rfq=rfq,
-            customer=rfq.customer,
-            contact=rfq.contact,
-            sales_rep=request.user,
-            quote_date=datetime.now().date(),
-            expiration_date=datetime.now().date() + timedelta(days=expiration_days),
-            delivery_terms=request.data.get('delivery_terms', ''),
-            notes=request.data.get('notes', ''),
-        )
-
-        # Copy items from RFQ to Quote
-        for rfq_item in rfq.items.all():
-            QuoteItem.objects.create(
-                quote=quote,
-                item=rfq_item.item,
-                quantity=rfq_item.requested_quantity,
-                unit_price=rfq_item.item.unit_price,
-                notes=rfq_item.notes
-            )
-
-        quote.calculate_totals()
-
-        # Update RFQ status
-        rfq.status = 'quoted'
-        rfq.save()
+        with transaction.atomic():
+            quote = Quote.objects.create(
+                quote_number=quote_number.upper(),
+                rfq=rfq,
+                customer=rfq.customer,
+                contact=rfq.contact,
+                sales_rep=request.user,
+                quote_date=datetime.now().date(),
+                expiration_date=datetime.now().date() + timedelta(days=expiration_days),
+                delivery_terms=request.data.get('delivery_terms', ''),
+                notes=request.data.get('notes', ''),
+            )
+
+            # Copy items from RFQ to Quote in one INSERT; bulk_create() skips
+            # QuoteItem.save(), so the totals are calculated once below
+            QuoteItem.objects.bulk_create([
+                QuoteItem(
+                    quote=quote,
+                    item=rfq_item.item,
+                    quantity=rfq_item.requested_quantity,
+                    unit_price=rfq_item.item.unit_price,
+                    notes=rfq_item.notes
+                )
+                for rfq_item in rfq.items.all()
+            ])
+
+            quote.calculate_totals()
+
+            # Update RFQ status
+            rfq.status = 'quoted'
+            rfq.save()
 
         serializer = QuoteSerializer(quote)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -631,11 +881,28 @@ class QuoteViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing Quotes
     """
-    queryset = Quote.objects.select_related('rfq', 'customer', 'contact', 'sales_rep', 'sales_order').prefetch_related('items__item').all()
+    queryset = Quote.objects.select_related('rfq', 'customer', 'contact', 'sales_rep', 'sales_order').with_totals()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['quote_number', 'customer__company_name', 'notes']
     ordering_fields = ['quote_date', 'expiration_date', 'created_at', 'total_amount']
     filterset_fields = ['status', 'customer', 'sales_rep', 'rfq']
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        """Annotate expiry; trim list columns and prefetch joined line items for single-object actions"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Only the columns QuoteListSerializer reads
+            queryset = queryset.select_related(None).select_related('customer').only(
+                'id', 'quote_number', 'customer__company_name', 'quote_date',
+                'expiration_date', 'status', 'version', 'total_amount', 'created_at'
+            )
+        elif self.detail:
+            queryset = queryset.prefetch_related(Prefetch(
+                'items',
+                queryset=QuoteItem.objects.select_related('item').defer('item__description')
+            ))
+        return queryset.with_expiry()
 
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
@@ -724,37 +991,40 @@ class QuoteViewSet(viewsets.ModelViewSet):
         original_quote = self.get_object()
 
         # Create new quote with incremented version
-        new_quote = Quote.objects.create(
-            quote_number=original_quote.quote_number,
-            rfq=original_quote.rfq,
-            customer=original_quote.customer,
-            contact=original_quote.contact,
-            sales_rep=request.user,
-            version=original_quote.version + 1,
-            status='draft',
-            quote_date=datetime.now().date(),
-            expiration_date=datetime.now().date() + timedelta(days=30),
-            discount=original_quote.discount,
-            tax=original_quote.tax,
-            shipping_cost=original_quote.shipping_cost,
-            payment_terms=original_quote.payment_terms,
-            delivery_terms=original_quote.delivery_terms,
-            validity_period=original_quote.validity_period,
-            notes=original_quote.notes,
-        )
-
-        # Copy items
-        for item in original_quote.items.all():
-            QuoteItem.objects.create(
-                quote=new_quote,
-                item=item.item,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-                discount=item.discount,
-                notes=item.notes
-            )
-
-        new_quote.calculate_totals()
+        with transaction.atomic():
+            new_quote = Quote.objects.create(
+                quote_number=original_quote.quote_number,
+                rfq=original_quote.rfq,
+                customer=original_quote.customer,
+                contact=original_quote.contact,
+                sales_rep=request.user,
+                version=original_quote.version + 1,
+                status='draft',
+                quote_date=datetime.now().date(),
+                expiration_date=datetime.now().date() + timedelta(days=30),
+                discount=original_quote.discount,
+                tax=original_quote.tax,
+                shipping_cost=original_quote.shipping_cost,
+                payment_terms=original_quote.payment_terms,
+                delivery_terms=original_quote.delivery_terms,
+                validity_period=original_quote.validity_period,
+                notes=original_quote.notes,
+            )
+
+            # Copy items in one INSERT
+            QuoteItem.objects.bulk_create([
+                QuoteItem(
+                    quote=new_quote,
+                    item_id=item.item_id,
+                    quantity=item.quantity,
+                    unit_price=item.unit_price,
+                    discount=item.discount,
+                    notes=item.notes
+                )
+                for item in original_quote.items.all()
+            ])
+
+            new_quote.calculate_totals()
 
         serializer = QuoteSerializer(new_quote)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -764,34 +1034,6 @@ class QuoteViewSet(viewsets.ModelViewSet):
         """Convert accepted quote to sales order"""
         quote = self.get_object()
 
-        if quote.status != 'accepted':
-            return Response(
-                {'error': 'Only accepted quotes can be converted to orders'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if quote.sales_order:
-            return Response(
-                {'error': 'Quote has already been converted to an order'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Check stock availability
-        insufficient_items = []
-        for quote_item in quote.items.all():
-            if quote_item.item.quantity < quote_item.quantity:
-                insufficient_items.append({
-                    'item': quote_item.item.name,
-                    'required': quote_item.quantity,
-                    'available': quote_item.item.quantity
-                })
-
-        if insufficient_items:
-            return Response(
-                {'error': 'Insufficient stock', 'items': insufficient_items},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         # Get order number
         order_number = request.data.get('order_number')
         if not order_number:
@@ -800,36 +1042,73 @@ class QuoteViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Create sales order
-        sales_order = SalesOrder.objects.create(
-            order_number=order_number.upper(),
-            customer=quote.customer,
-            contact=quote.contact,
-            order_date=datetime.now().date(),
-            status='draft',
-            payment_status='unpaid',
-            discount=quote.discount,
-            tax=quote.tax,
-            shipping_cost=quote.shipping_cost,
-            notes=f"Converted from Quote {quote.quote_number}. {quote.notes}"
-        )
-
-        # Copy items from quote to sales order
-        for quote_item in quote.items.all():
-            SalesOrderItem.objects.create(
-                sales_order=sales_order,
-                item=quote_item.item,
-                quantity=quote_item.quantity,
-                unit_price=quote_item.unit_price,
-                discount=quote_item.discount
-            )
-
-        sales_order.calculate_totals()
-
-        # Link quote to sales order
-        quote.sales_order = sales_order
-        quote.status = 'converted'
-        quote.save()
+        with transaction.atomic():
+            # Lock the quote and re-read it so concurrent conversions cannot
+            # both create an order
+            quote = Quote.objects.select_for_update().get(pk=quote.pk)
+
+            if quote.status != 'accepted':
+                return Response(
+                    {'error': 'Only accepted quotes can be converted to orders'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if quote.sales_order_id:
+                return Response(
+                    {'error': 'Quote has already been converted to an order'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Check stock availability against locked rows
+            lines = list(quote.items.all())
+            stock = lock_stock(lines)
+            insufficient_items = []
+            for quote_item in lines:
+                item = stock[quote_item.item_id]
+                if item.quantity < quote_item.quantity:
+                    insufficient_items.append({
+                        'item': item.name,
+                        'required': quote_item.quantity,
+                        'available': item.quantity
+                    })
+
+            if insufficient_items:
+                return Response(
+                    {'error': 'Insufficient stock', 'items': insufficient_items},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            sales_order = SalesOrder.objects.create(
+                order_number=order_number.upper(),
+                customer_id=quote.customer_id,
+                contact_id=quote.contact_id,
+                order_date=datetime.now().date(),
+                status='draft',
+                payment_status='unpaid',
+                discount=quote.discount,
+                tax=quote.tax,
+                shipping_cost=quote.shipping_cost,
+                notes=f"Converted from Quote {quote.quote_number}. {quote.notes}"
+            )
+
+            # Copy items from quote to sales order in one INSERT
+            SalesOrderItem.objects.bulk_create([
+                SalesOrderItem(
+                    sales_order=sales_order,
+                    item_id=quote_item.item_id,
+                    quantity=quote_item.quantity,
+                    unit_price=quote_item.unit_price,
+                    discount=quote_item.discount
+                )
+                for quote_item in lines
+            ])
+
+            sales_order.calculate_totals()
+
+            # Link quote to sales order
+            quote.sales_order = sales_order
+            quote.status = 'converted'
+            quote.save()
 
         serializer = SalesOrderSerializer(sales_order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -1,8 +1,7 @@
 """
 Admin export actions for CSV and Excel
 """
-from datetime import datetime
-from ozed_tech_project.export_utils import CSVExporter, ExcelExporter, PDFExporter
+from ozed_tech_project.export_utils import CSVExporter, ExcelExporter, PDFExporter, export_filename
 
 
 def export_to_csv_action(modeladmin, request, queryset):
@@ -24,7 +23,7 @@ def export_to_csv_action(modeladmin, request, queryset):
             row.append(value if value is not None else 'N/A')
         rows.append(row)
 
-    filename = f'{model_name.lower()}_export_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    filename = export_filename(f'{model_name.lower()}_export', request.user, 'csv')
     return CSVExporter.export_to_csv(filename, headers, rows)
 
 export_to_csv_action.short_description = "Export selected to CSV"
@@ -49,7 +48,7 @@ def export_to_excel_action(modeladmin, request, queryset):
             row.append(value if value is not None else 'N/A')
         rows.append(row)
 
-    filename = f'{model_name.lower()}_export_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    filename = export_filename(f'{model_name.lower()}_export', request.user, 'xlsx')
     return ExcelExporter.export_to_excel(filename, model_name, headers, rows)
 
 export_to_excel_action.short_description = "Export selected to Excel"
@@ -75,7 +74,7 @@ def export_items_csv_action(modeladmin, request, queryset):
             'Yes' if item.is_active else 'No'
         ])
 
-    filename = f'inventory_items_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    filename = export_filename('inventory_items', request.user, 'csv')
     return CSVExporter.export_to_csv(filename, headers, rows)
 
 export_items_csv_action.short_description = "📥 Export selected items to CSV"
@@ -101,7 +100,7 @@ def export_items_excel_action(modeladmin, request, queryset):
             'Yes' if item.is_active else 'No'
         ])
 
-    filename = f'inventory_items_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    filename = export_filename('inventory_items', request.user, 'xlsx')
     return ExcelExporter.export_to_excel(filename, 'Inventory Items', headers, rows)
 
 export_items_excel_action.short_description = "📊 Export selected items to Excel"
@@ -129,7 +128,7 @@ def export_sales_orders_csv_action(modeladmin, request, queryset):
             f'{order.total_amount:.2f}'
         ])
 
-    filename = f'sales_orders_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    filename = export_filename('sales_orders', request.user, 'csv')
     return CSVExporter.export_to_csv(filename, headers, rows)
 
 export_sales_orders_csv_action.short_description = "📥 Export selected orders to CSV"
@@ -157,7 +156,7 @@ def export_sales_orders_excel_action(modeladmin, request, queryset):
             float(order.total_amount)
         ])
 
-    filename = f'sales_orders_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    filename = export_filename('sales_orders', request.user, 'xlsx')
     return ExcelExporter.export_to_excel(filename, 'Sales Orders', headers, rows)
 
 export_sales_orders_excel_action.short_description = "📊 Export selected orders to Excel"
@@ -170,7 +169,11 @@ def generate_invoice_action(modeladmin, request, queryset):
         messages.warning(request, 'Please select exactly one sales order to generate an invoice.')
         return None
 
-    sales_order = queryset.first()
+    from django.db.models import Prefetch
+    from inventory.models import SalesOrderItem
+    sales_order = queryset.prefetch_related(
+        Prefetch('items', queryset=SalesOrderItem.objects.select_related('item'))
+    ).first()
     return PDFExporter.create_invoice(sales_order)
 
 generate_invoice_action.short_description = "📄 Generate PDF Invoice"
@@ -181,6 +184,11 @@ def export_customers_csv_action(modeladmin, request, queryset):
     headers = ['Company Name', 'Customer Type', 'Industry', 'Address', 'City',
               'State', 'Country', 'Postal Code', 'Credit Limit', 'Website', 'Created Date']
 
+    queryset = queryset.only(
+        'company_name', 'customer_type', 'industry', 'address', 'city', 'state',
+        'country', 'postal_code', 'credit_limit', 'website', 'created_at'
+    )
+
     rows = []
     for customer in queryset:
         rows.append([
@@ -197,7 +205,7 @@ def export_customers_csv_action(modeladmin, request, queryset):
             customer.created_at.strftime('%Y-%m-%d')
         ])
 
-    filename = f'customers_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    filename = export_filename('customers', request.user, 'csv')
     return CSVExporter.export_to_csv(filename, headers, rows)
 
 export_customers_csv_action.short_description = "📥 Export selected customers to CSV"
@@ -208,6 +216,11 @@ def export_customers_excel_action(modeladmin, request, queryset):
     headers = ['Company Name', 'Customer Type', 'Industry', 'Address', 'City',
               'State', 'Country', 'Postal Code', 'Credit Limit', 'Website', 'Created Date']
 
+    queryset = queryset.only(
+        'company_name', 'customer_type', 'industry', 'address', 'city', 'state',
+        'country', 'postal_code', 'credit_limit', 'website', 'created_at'
+    )
+
     rows = []
     for customer in queryset:
         rows.append([
@@ -224,7 +237,7 @@ def export_customers_excel_action(modeladmin, request, queryset):
             customer.created_at.strftime('%Y-%m-%d')
         ])
 
-    filename = f'customers_{request.user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+    filename = export_filename('customers', request.user, 'xlsx')
     return ExcelExporter.export_to_excel(filename, 'Customers', headers, rows)
 
 export_customers_excel_action.short_description = "📊 Export selected customers to Excel"
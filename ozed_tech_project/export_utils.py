@@ -2,10 +2,14 @@
 Export utilities for CSV, Excel, and PDF generation
 """
 import csv
+import time
+from itertools import chain, islice
 from io import BytesIO
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -15,6 +19,22 @@ from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from datetime import datetime
 
 
+def export_filename(prefix, user, extension):
+    """Download filename stamped with the requesting user and the local time"""
+    return f'{prefix}_{user.username}_{time.strftime("%Y%m%d_%H%M%S")}.{extension}'
+
+
+# Rows read up front to size the Excel columns; the rest are streamed unread
+EXCEL_WIDTH_SAMPLE_ROWS = 200
+
+
+class Echo:
+    """Pseudo-buffer that hands back each written value instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
 class CSVExporter:
     """Export data to CSV format"""
 
@@ -37,6 +57,28 @@ class CSVExporter:
 
         return response
 
+    @staticmethod
+    def stream_to_csv(filename, headers, rows):
+        """
+        Stream data to CSV without holding the whole file in memory
+
+        Args:
+            filename: Name of the file to download
+            headers: List of column headers
+            rows: Iterable of data rows, consumed lazily as the response is sent
+        """
+        writer = csv.writer(Echo())
+
+        def stream():
+            yield writer.writerow(headers)
+            for row in rows:
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(stream(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
+
 
 class ExcelExporter:
     """Export data to Excel format"""
@@ -46,15 +88,29 @@ class ExcelExporter:
         """
         Export data to Excel
 
+        Uses a write-only workbook, so cells are streamed out as rows are
+        appended instead of being held as a full in-memory sheet. Column
+        widths are sized from the headers and the first rows only.
+
         Args:
             filename: Name of the file to download
             sheet_name: Name of the worksheet
             headers: List of column headers
-            rows: List of data rows
+            rows: Iterable of data rows
         """
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = sheet_name
+        rows = iter(rows)
+        sample = list(islice(rows, EXCEL_WIDTH_SAMPLE_ROWS))
+
+        # Column widths must be set before a write-only sheet receives rows
+        widths = {}
+        for row_data in [headers, *sample]:
+            for col_num, cell_value in enumerate(row_data, 1):
+                widths[col_num] = max(widths.get(col_num, 0), len(str(cell_value)))
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(sheet_name)
+        for col_num, max_length in widths.items():
+            worksheet.column_dimensions[get_column_letter(col_num)].width = min(max_length + 2, 50)
 
         # Style for headers
         header_font = Font(bold=True, color="FFFFFF", size=12)
@@ -62,32 +118,24 @@ class ExcelExporter:
         header_alignment = Alignment(horizontal="center", vertical="center")
 
         # Write headers
-        for col_num, header in enumerate(headers, 1):
-            cell = worksheet.cell(row=1, column=col_num)
-            cell.value = header
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
             cell.font = header_font
             cell.fill = header_fill
             cell.alignment = header_alignment
+            header_cells.append(cell)
+        worksheet.append(header_cells)
 
         # Write data rows
-        for row_num, row_data in enumerate(rows, 2):
-            for col_num, cell_value in enumerate(row_data, 1):
-                cell = worksheet.cell(row=row_num, column=col_num)
-                cell.value = cell_value
-                cell.alignment = Alignment(horizontal="left", vertical="center")
-
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        cell_alignment = Alignment(horizontal="left", vertical="center")
+        for row_data in chain(sample, rows):
+            row_cells = []
+            for cell_value in row_data:
+                cell = WriteOnlyCell(worksheet, value=cell_value)
+                cell.alignment = cell_alignment
+                row_cells.append(cell)
+            worksheet.append(row_cells)
 
         # Save to BytesIO
         output = BytesIO()
@@ -0,0 +1,40 @@
+from rest_framework import pagination
+from rest_framework.settings import api_settings
+
+
+class CreatedAtCursorPagination(pagination.CursorPagination):
+    """
+    Cursor pagination that seeks to the next page with a WHERE on created_at
+    instead of an OFFSET, so deep pages cost the same as the first.
+    """
+    ordering = '-created_at'
+
+
+class KeysetPagination(pagination.PageNumberPagination):
+    """
+    Page-number pagination (with a count) by default; requests that ask for
+    ``?ordering=-created_at`` get cursor pages instead.
+
+    DRF's cursor only seeks on the leading ordering column and falls back to an
+    offset among rows that tie on it, so it is reserved for the near-unique,
+    indexed created_at. Every other ordering keeps the page-number response.
+    """
+    keyset_ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        ordering_param = api_settings.ORDERING_PARAM
+        if request.query_params.get(ordering_param, '').strip() == self.keyset_ordering:
+            self.cursor_paginator = CreatedAtCursorPagination()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
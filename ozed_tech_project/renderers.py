@@ -1,3 +1,4 @@
+import orjson
 from rest_framework import renderers
 from django.template.loader import render_to_string
 
@@ -29,3 +30,30 @@ class SimpleHTMLRenderer(renderers.TemplateHTMLRenderer):
         }
 
         return context
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer that encodes the default compact output with orjson.
+
+    Dates, Decimals and other non-native types go through DRF's own encoder, so
+    the bytes match JSONRenderer (e.g. a ``Z`` suffix on UTC datetimes).
+    Indented, non-compact or ASCII-only output falls back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+        # Keep JSONRenderer's escaping of the two JavaScript line terminators
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -88,9 +89,35 @@ DATABASES = {
         'PASSWORD': 'qazxswedc',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Reuse connections across requests instead of reconnecting each time
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # psycopg 3: switch statements run this many times on a connection
+            # to server-side prepared statements, skipping parse/plan after that
+            'prepare_threshold': 3,
+        },
     }
 }
 
+# Cache used for dashboard analytics payloads. It has to be shared by every
+# worker so an invalidation in one process is seen by the others: Redis when
+# REDIS_URL is set, otherwise a database table (python manage.py createcachetable).
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'ozed_tech_cache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -151,7 +178,7 @@ REST_FRAMEWORK = {
         'ozed_tech_project.permissions.DjangoModelPermissionsWithView',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'ozed_tech_project.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
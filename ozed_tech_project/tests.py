@@ -0,0 +1,52 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """ORJSONRenderer produces the same bytes as DRF's JSONRenderer"""
+
+    payload = {
+        'id': 7,
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'name': 'Caf\u00e9\u2028line',
+        'price': Decimal('12.50'),
+        'ratio': 0.25,
+        'active': True,
+        'notes': None,
+        'label': gettext_lazy('Pending'),
+        'created_at': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'local_at': timezone.make_aware(datetime.datetime(2024, 5, 1, 12, 30), timezone=datetime.timezone(datetime.timedelta(hours=2))),
+        'naive_at': datetime.datetime(2024, 5, 1, 12, 30),
+        'due': datetime.date(2024, 6, 1),
+        'at': datetime.time(9, 15),
+        'lead_time': datetime.timedelta(days=2),
+        'items': [{'sku': 'A-1', 'quantity': 3}, {'sku': 'B-2', 'quantity': 0}],
+        1: 'numeric key',
+    }
+
+    def assert_matches(self, accepted_media_type=None, renderer_context=None):
+        self.assertEqual(
+            ORJSONRenderer().render(self.payload, accepted_media_type, renderer_context),
+            JSONRenderer().render(self.payload, accepted_media_type, renderer_context),
+        )
+
+    def test_compact_output_matches_json_renderer(self):
+        self.assert_matches('application/json')
+
+    def test_utc_datetimes_use_z_suffix(self):
+        self.assertIn(b'"2024-05-01T12:30:15.123456Z"', ORJSONRenderer().render(self.payload))
+
+    def test_indent_is_honoured(self):
+        self.assert_matches('application/json; indent=4')
+        self.assert_matches('application/json', {'indent': 2})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0002_contact_crm_contact_custome_dedc88_idx_and_more'),
+        ('ticketing', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['due_date', 'status'], name='ticketing_t_due_dat_654547_idx'),
+        ),
+    ]
@@ -87,6 +87,7 @@ class Ticket(models.Model):
             models.Index(fields=['priority']),
             models.Index(fields=['customer']),
             models.Index(fields=['assigned_to']),
+            models.Index(fields=['due_date', 'status']),
         ]
 
     def __str__(self):
@@ -2,7 +2,7 @@
 URL configuration for the Ticketing app.
 """
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import (
     TicketViewSet,
     TicketCommentViewSet,
@@ -11,7 +11,7 @@ from .views import (
 )
 
 # Create router and register viewsets
-router = DefaultRouter()
+router = SimpleRouter()
 router.register(r'tickets', TicketViewSet, basename='ticket')
 router.register(r'comments', TicketCommentViewSet, basename='ticketcomment')
 router.register(r'attachments', TicketAttachmentViewSet, basename='ticketattachment')
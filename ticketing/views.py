@@ -6,7 +6,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, Count, Avg, F
 from django.utils import timezone
 
 from .models import Ticket, TicketComment, TicketAttachment, TicketHistory
@@ -263,11 +263,11 @@ class TicketViewSet(viewsets.ModelViewSet):
             stats['by_category'][category_value] = queryset.filter(category=category_value).count()
 
         # Average response and resolution times
-        resolved_tickets = queryset.filter(resolved_at__isnull=False)
-        if resolved_tickets.exists():
-            stats['avg_resolution_time_hours'] = sum(
-                t.resolution_time for t in resolved_tickets if t.resolution_time
-            ) / resolved_tickets.count()
+        avg_resolution = queryset.filter(resolved_at__isnull=False).aggregate(
+            avg=Avg(F('resolved_at') - F('created_at'))
+        )['avg']
+        if avg_resolution is not None:
+            stats['avg_resolution_time_hours'] = avg_resolution.total_seconds() / 3600
 
         return Response(stats)
 